@@ -1,6 +1,8 @@
 import streamlit as st
 from streamlit_cookies_controller import CookieController
 
+from components.warmup import start_icon_warmup
+
 USER_CREDENTIALS = {
     "admin": "1234",
     "sarah": "password"
@@ -11,6 +13,8 @@ def login(username, password):
         return USER_CREDENTIALS[username] == password
     return False
 
+start_icon_warmup()
+
 st.title("Login Page")
 
 st.markdown("""
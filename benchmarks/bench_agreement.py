@@ -0,0 +1,26 @@
+# Benchmark: per-label agreement statistics over many stored comparisons.
+# run from the repository root: python -m benchmarks.bench_agreement
+import timeit
+
+import numpy as np
+
+from components.agreement import agreement_stats
+from components.dentition import FDI_TEETH
+from components.tooth_transitions import REACHABLE_STATUSES
+
+
+def random_stack(rng, cases: int) -> np.ndarray:
+    statuses = np.array(sorted(REACHABLE_STATUSES), dtype=np.uint8)
+    return rng.choice(statuses, size=(cases, len(FDI_TEETH)))
+
+
+def main(repeat: int = 5):
+    rng = np.random.default_rng(0)
+    for cases in (1, 1_000, 10_000, 50_000):
+        manual, ai = random_stack(rng, cases), random_stack(rng, cases)
+        best = min(timeit.repeat(lambda: agreement_stats(manual, ai), repeat=repeat, number=1))
+        print(f"{cases:>6} comparisons: {best * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
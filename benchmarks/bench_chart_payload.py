@@ -0,0 +1,92 @@
+# Measures the bytes one rerun sends to the browser for the tooth charts, per icon source.
+# "inline" is the old behaviour (st.image uploads / base64 data URLs), "static" points <img>
+# tags at the pre-scaled icons under ./static, "atlas" uses the sprite sheet.
+# Run the prebuild first, then from the repository root: python -m benchmarks.bench_chart_payload
+from contextlib import nullcontext
+from io import BytesIO
+
+from components import teeth as teeth_module
+from components.teeth import load_teeth, load_teeth_circle, render_tooth_cell, circle_html, circle_fragment
+from input.teethSet import teeth as manual_teeth
+from AIOutput.teethSet import teeth as ai_teeth
+
+MODES = {
+    "inline": ("image", "inline"),
+    "static": ("image", "static"),
+    "atlas": ("atlas", "static"),
+}
+CORRECTED = {16, 26, 36}
+
+
+class RecordingStreamlit:
+    # just enough of the streamlit API for the chart functions, counting payload bytes
+    def __init__(self):
+        self.session_state = {"corrected_teeth": CORRECTED}
+        self.bytes = 0
+        self.elements = 0
+
+    def columns(self, n):
+        return [nullcontext() for _ in range(n)]
+
+    def markdown(self, body, unsafe_allow_html=False):
+        self.bytes += len(body.encode("utf-8"))
+        self.elements += 1
+
+    def image(self, img, **kwargs):
+        buffer = BytesIO()
+        img.save(buffer, format="PNG")
+        self.bytes += len(buffer.getvalue())
+        self.elements += 1
+
+    def empty(self):
+        self.elements += 1
+
+    @staticmethod
+    def get_option(name):
+        return True
+
+
+def chart_grid():
+    load_teeth(ai_teeth, False, outline_corrected_images=True)
+
+
+def chart_circle():
+    load_teeth_circle(ai_teeth, False)
+
+
+def comparison_rows():
+    atlas = teeth_module.get_chart_atlas()
+    for tooth, status in ai_teeth.items():
+        if status != manual_teeth[tooth]:
+            render_tooth_cell(tooth, status, atlas=atlas)
+
+
+def measure(scenario, renderer, source):
+    recorder = RecordingStreamlit()
+    teeth_module.st = recorder
+    teeth_module.TOOTH_CHART_RENDERER = renderer
+    teeth_module.TOOTH_ICON_SOURCE = source
+    circle_html.cache_clear()
+    circle_fragment.cache_clear()
+    scenario()
+    return recorder.bytes, recorder.elements
+
+
+def main():
+    original_st = teeth_module.st
+    try:
+        scenarios = (("chart (grid)", chart_grid), ("chart (circle)", chart_circle),
+                     ("comparison rows", comparison_rows))
+        print(f"{'scenario':>16} " + " ".join(f"{mode:>18}" for mode in MODES))
+        for name, scenario in scenarios:
+            cells = []
+            for renderer, source in MODES.values():
+                payload, elements = measure(scenario, renderer, source)
+                cells.append(f"{payload / 1024:8.1f} KB ({elements:2d} el)")
+            print(f"{name:>16} " + " ".join(f"{cell:>18}" for cell in cells))
+    finally:
+        teeth_module.st = original_st
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# Throughput of scripts.class_reports: a synthetic cohort built from scratch per worker count.
+# Every case gets random findings on the case_1 fixture X-ray, so no two reports are identical.
+# From the repository root: python -m benchmarks.bench_class_reports [cases]
+import json
+import os
+import random
+import sys
+import tempfile
+
+from components.tooth_transitions import REACHABLE_STATUSES
+from scripts.class_reports import TOP_ROW, BOTTOM_ROW, generate, read_cases
+
+PANO = os.path.abspath("cypress/fixtures/case_1.jpeg")
+# flag values, as a case file may carry them instead of status strings
+STATUSES = [int(status) for status in REACHABLE_STATUSES if status]
+
+
+def write_cohort(directory: str, count: int) -> str:
+    rng = random.Random(0)
+    manifest = os.path.join(directory, "cases.jsonl")
+    with open(manifest, "w", encoding="utf-8") as f:
+        for i in range(count):
+            case = {"case_id": f"case_{i:04d}", "rnumber": f"r{i:07d}", "student_name": f"Student {i}",
+                    "manual": {str(tooth): rng.choice(STATUSES) for tooth in TOP_ROW + BOTTOM_ROW},
+                    "manual_image": PANO}
+            f.write(json.dumps(case) + "\n")
+    return manifest
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    worker_counts = sorted({1, 2, 4, os.cpu_count()})
+    with tempfile.TemporaryDirectory() as directory:
+        cases = read_cases(write_cohort(directory, count))
+        print(f"{count} cases, {os.cpu_count()} CPUs")
+        for workers in worker_counts:
+            stats = generate(cases, os.path.join(directory, f"out_{workers}"), workers=workers, verbose=False)
+            print(f"{workers:3d} workers {stats['seconds']:6.1f} s {stats['reports_per_second']:6.2f} reports/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# Payload size and encode time of the tooth icons per encoding (components/icon_encoding.py).
+# "current" is the old behaviour: a default-settings PNG, encoded again on every call.
+# chart render: the data URLs of one 32 tooth chart at the UI height, cold cache.
+# The PDFs don't encode icons any more, see bench_pdf_images.
+# From the repository root: python -m benchmarks.bench_icon_encoding
+import time
+from io import BytesIO
+
+from components.icon_encoding import ENCODINGS, encode_image, to_data_url
+from components.teeth import get_tooth_image
+from AIOutput.teethSet import teeth as ai_teeth
+
+
+def encode_current(img) -> bytes:
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def chart_render(encoding: str, height: int = 80):
+    icons = [get_tooth_image(tooth, status, height=height) for tooth, status in ai_teeth.items()]
+    start = time.perf_counter()
+    payload = 0
+    for img in icons:
+        data = encode_current(img) if encoding == "current" else encode_image(img, encoding)
+        payload += len(to_data_url(data, "png" if encoding == "current" else encoding))
+    return payload, time.perf_counter() - start
+
+
+def main():
+    print(f"{'encoding':>10} {'chart payload':>14} {'chart encode':>13}")
+    for encoding in ("current", *ENCODINGS):
+        payload, seconds = chart_render(encoding)
+        print(f"{encoding:>10} {payload / 1024:11.1f} KB {seconds * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Build time and size of both PDF reports per way of handing tooth icons to reportlab.
+# "png per call": the old behaviour, every tooth PNG-encoded into a new Image flowable.
+# "cached png": encoded bytes cached per process, still decoded again per Image flowable.
+# "shared reader": the cached ImageReader behind components.pdf.tooth_image.
+# a85 is reportlab's default ASCII85 encoding of image streams, which components.pdf switches off
+# while it builds (binary_image_streams).
+# cold starts from empty tooth and pano caches, warm is the next report of the same process.
+# The panoramic X-rays are resampled to PDF_IMAGE_DPI first (cached per process, so warm runs skip it),
+# the "small pano" rows leave mostly the icons.
+# From the repository root: python -m benchmarks.bench_pdf_images
+import time
+from contextlib import nullcontext
+from io import BytesIO
+
+from PIL import Image as PILImage
+
+from reportlab import rl_config
+
+from components import pdf, pdf_profesionnal
+from components.dentition import Dentition
+from components.teeth import get_tooth_image, get_tooth_image_bytes
+from components.tooth_cache import tooth_image_cache
+from input.teethSet import teeth as manual_teeth
+from AIOutput.teethSet import teeth as ai_teeth
+
+PANO = "cypress/fixtures/case_1.jpeg"
+SIGN = "icons/dentists-approved.png"
+TOP_ROW = [18, 17, 16, 15, 14, 13, 12, 11, 21, 22, 23, 24, 25, 26, 27, 28]
+BOTTOM_ROW = [48, 47, 46, 45, 44, 43, 42, 41, 31, 32, 33, 34, 35, 36, 37, 38]
+
+
+def image_flowable(data: bytes, height_pt: float):
+    img = pdf.Image(BytesIO(data))
+    img.drawHeight = height_pt
+    img.drawWidth = height_pt * img.imageWidth / img.imageHeight
+    return img
+
+
+def png_per_call(number, status, *, height_pt=pdf.TOOTH_H_PT):
+    buffer = BytesIO()
+    get_tooth_image(number, status, height=int(height_pt * pdf.RASTER_SCALE)).save(buffer, format="PNG")
+    return image_flowable(buffer.getvalue(), height_pt)
+
+
+def cached_png(number, status, *, height_pt=pdf.TOOTH_H_PT):
+    data = get_tooth_image_bytes(number, status, height=int(height_pt * pdf.RASTER_SCALE), encoding="png-fast")
+    return image_flowable(data, height_pt)
+
+
+def build_reports(pano: bytes, sign: bytes) -> tuple[bytes, bytes]:
+    manual, ai = Dentition(manual_teeth).adult, Dentition(ai_teeth).adult
+    student = pdf.create_pdf("r0000000", "Student", "1", "2024-01-01", "40", "F", pano, pano,
+                             manual, ai, top_row=TOP_ROW, bottom_row=BOTTOM_ROW)
+    professional = pdf_profesionnal.create_pdf_professional(
+        patient_id="1", patient_name="Patient", scan_date="2024-01-01", birth_date="1984-01-01", age="40",
+        gender="F", pano_bytes=pano, manual_teeth=ai, top_row=TOP_ROW, bottom_row=BOTTOM_ROW,
+        sign_image_bytes=sign)
+    return student, professional
+
+
+def small_jpeg() -> bytes:
+    buffer = BytesIO()
+    PILImage.new("RGB", (300, 150), "gray").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def image_xobjects(data: bytes) -> int:
+    return data.count(b"/Subtype /Image")
+
+
+def main():
+    with open(PANO, "rb") as f:
+        pano = f.read()
+    with open(SIGN, "rb") as f:
+        sign = f.read()
+
+    print(f"{'icons':>14} {'a85':>4} {'pano':>6} {'cold':>8} {'warm':>8} {'student pdf':>19} {'professional pdf':>19}")
+    original_image, original_a85, original_streams = pdf.tooth_image, rl_config.useA85, pdf.binary_image_streams
+    variants = (("png per call", png_per_call, 1), ("cached png", cached_png, 1), ("shared reader", original_image, 1),
+                ("shared reader", original_image, 0))
+    for pano_name, pano_bytes in (("full", pano), ("small", small_jpeg())):
+        for name, tooth_image, use_a85 in variants:
+            pdf.tooth_image = pdf_profesionnal.tooth_image = tooth_image
+            rl_config.useA85 = use_a85
+            if use_a85:
+                pdf.binary_image_streams = pdf_profesionnal.binary_image_streams = nullcontext
+            try:
+                tooth_image_cache.clear()
+                pdf.pdf_image_cache.clear()
+                timings = []
+                for _ in range(2):
+                    start = time.perf_counter()
+                    student, professional = build_reports(pano_bytes, sign)
+                    timings.append(time.perf_counter() - start)
+            finally:
+                pdf.tooth_image = pdf_profesionnal.tooth_image = original_image
+                rl_config.useA85 = original_a85
+                pdf.binary_image_streams = pdf_profesionnal.binary_image_streams = original_streams
+            cold, warm = timings
+            print(f"{name:>14} {'on' if use_a85 else 'off':>4} {pano_name:>6} {cold * 1000:5.0f} ms {warm * 1000:5.0f} ms "
+                  f"{len(student) / 1024:7.1f} KB {image_xobjects(student):3d} img "
+                  f"{len(professional) / 1024:7.1f} KB {image_xobjects(professional):3d} img")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# Micro-benchmark: table-driven status resolver vs the original if/elif chain.
+# run from the repository root: python -m benchmarks.bench_status_resolver
+import timeit
+
+from benchmarks.legacy_status import legacy_icon_path
+from components.tooth_status import resolve_icon_path
+from input.teethSet import teeth as input_teeth
+from AIOutput.teethSet import teeth as ai_teeth, childteeth as ai_childteeth
+
+SAMPLE = [
+    *input_teeth.items(),
+    *ai_teeth.items(),
+    *ai_childteeth.items(),
+    (12, "missing,implant"), (26, "missing,implant,crown"), (31, "normal,bridge,rcf"),
+    (45, "missing,bridge"), (46, "missing,bridge,implant"), (15, "normal,impacted"),
+]
+
+
+def run_chart(resolver):
+    for tooth, status in SAMPLE:
+        resolver(tooth, status)
+
+
+def main(repeat: int = 5, number: int = 2000):
+    for name, resolver in (("legacy chain", legacy_icon_path), ("table", resolve_icon_path)):
+        best = min(timeit.repeat(lambda: run_chart(resolver), repeat=repeat, number=number))
+        per_lookup_ns = best / (number * len(SAMPLE)) * 1e9
+        print(f"{name:>12}: {per_lookup_ns:8.1f} ns/lookup ({len(SAMPLE)} teeth x {number} runs)")
+
+
+if __name__ == "__main__":
+    main()
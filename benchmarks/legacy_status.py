@@ -0,0 +1,41 @@
+# The original if/elif icon resolver, the reference that components.tooth_status.resolve_icon_path
+# is checked against (test/test_tooth_status.py) and benchmarked against (bench_status_resolver.py).
+
+
+def legacy_icon_path(tooth_number, status):
+    if tooth_number>50:
+        if status is not None and status != "normal":
+            if tooth_number%10<4:
+                tooth_number-=40
+            else:
+                tooth_number-=38
+
+    if status is None or status == "normal":
+        icon_path = f"Icon_normal_teeth/{tooth_number}.png"
+    elif status == "missing":
+        icon_path = f"Icon_missing_teeth/{tooth_number}.png"
+    elif "impacted" in status:
+        icon_path = f"Icon_impacted/{tooth_number}.png"
+    elif status == "missing,implant":
+        icon_path = f"Icon_implant/{tooth_number}.png"
+    elif "df" in status and "rcf" in status:
+        icon_path = f"Icon_df_rcf/{tooth_number}.png"
+    elif "df" in status:
+        icon_path = f"Icon_df/{tooth_number}.png"
+    elif "rcf" in status and "crown" in status:
+        icon_path = f"Icon_crown_rcf/{tooth_number}.png"
+    elif "implant" in status and "crown" in status:
+        icon_path = f"Icon_crown_implant/{tooth_number}.png"
+    elif "crown" in status:
+        icon_path = f"Icon_crown/{tooth_number}.png"
+    elif "rcf" in status and "bridge" in status:
+        icon_path = f"Icon_bridge_tooth_rcf/{tooth_number}.png"
+    elif "bridge" in status and "implant" in status:
+        icon_path = f"Icon_bridge_implant/{tooth_number}.png"
+    elif status == "missing,bridge":
+        icon_path = f"Icon_bridge_pontic/{tooth_number}.png"
+    elif "bridge" in status and "normal" in status:
+        icon_path = f"Icon_bridge_tooth/{tooth_number}.png"
+    else:
+        icon_path = f"Icon_normal_teeth/{tooth_number}.png"
+    return icon_path
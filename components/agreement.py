@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from components.comparison import flag_array
+from components.tooth_status import ToothFlag
+
+F = ToothFlag
+
+# findings that are compared label by label, "normal" is just the absence of all of them
+AGREEMENT_LABELS = (F.MISSING, F.DF, F.RCF, F.CROWN, F.BRIDGE, F.IMPLANT, F.IMPACTED)
+
+
+def _ratio(numerator, denominator) -> float:
+    # nan when the label never came up on the side that is divided by
+    return numerator / denominator if denominator else float("nan")
+
+
+@dataclass(frozen=True)
+class LabelAgreement:
+    """Confusion counts of one label over every compared tooth, the reference side counts as the truth."""
+    label: ToothFlag
+    tp: int
+    fp: int
+    fn: int
+    tn: int
+
+    @property
+    def total(self) -> int:
+        return self.tp + self.fp + self.fn + self.tn
+
+    @property
+    def precision(self) -> float:
+        return _ratio(self.tp, self.tp + self.fp)
+
+    @property
+    def recall(self) -> float:
+        return _ratio(self.tp, self.tp + self.fn)
+
+    @property
+    def f1(self) -> float:
+        return _ratio(2 * self.tp, 2 * self.tp + self.fp + self.fn)
+
+    @property
+    def kappa(self) -> float:
+        # Cohen's kappa: observed agreement corrected for the agreement expected by chance
+        total = self.total
+        if not total:
+            return float("nan")
+        observed = (self.tp + self.tn) / total
+        expected = ((self.tp + self.fp) * (self.tp + self.fn) + (self.fn + self.tn) * (self.fp + self.tn)) / total ** 2
+        if expected == 1:
+            # both sides gave every tooth the same answer
+            return 1.0
+        return (observed - expected) / (1 - expected)
+
+    def as_dict(self) -> dict:
+        return {"label": self.label.name.lower(), "tp": self.tp, "fp": self.fp, "fn": self.fn, "tn": self.tn,
+                "precision": self.precision, "recall": self.recall, "f1": self.f1, "kappa": self.kappa}
+
+
+def confusion_counts(reference, predicted, tooth_numbers=None, labels=AGREEMENT_LABELS) -> np.ndarray:
+    """``(labels, 4)`` array of tp, fp, fn, tn per label, counted over all teeth (and dentitions of a stack).
+
+    Takes anything compare_dentitions takes: dentitions, mappings, stacks of them or flag arrays.
+    """
+    ref_flags, numbers = flag_array(reference, tooth_numbers)
+    pred_flags, _ = flag_array(predicted, numbers)
+    if ref_flags.shape != pred_flags.shape:
+        raise ValueError(f"can't compare dentitions of shape {ref_flags.shape} and {pred_flags.shape}")
+
+    # one row per tooth, one column per ToothFlag bit, lowest bit first
+    columns = [label.bit_length() - 1 for label in labels]
+    ref = np.unpackbits(ref_flags.reshape(-1, 1), axis=-1, bitorder="little")[:, columns].astype(bool)
+    pred = np.unpackbits(pred_flags.reshape(-1, 1), axis=-1, bitorder="little")[:, columns].astype(bool)
+
+    tp = np.count_nonzero(ref & pred, axis=0)
+    ref_positive = np.count_nonzero(ref, axis=0)
+    pred_positive = np.count_nonzero(pred, axis=0)
+    fp = pred_positive - tp
+    fn = ref_positive - tp
+    tn = len(ref) - tp - fp - fn
+    return np.stack([tp, fp, fn, tn], axis=1)
+
+
+def agreement_stats(reference, predicted, tooth_numbers=None, labels=AGREEMENT_LABELS) -> dict[ToothFlag, LabelAgreement]:
+    """Per-label precision, recall, F1 and Cohen's kappa of ``predicted`` (e.g. the AI) against ``reference``."""
+    counts = confusion_counts(reference, predicted, tooth_numbers, labels)
+    return {label: LabelAgreement(label, *map(int, row)) for label, row in zip(labels, counts)}
@@ -0,0 +1,161 @@
+import glob
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from components.comparison import compare_dentitions
+from components.dentition import ADULT_TEETH, CHILD_TEETH, FDI_TEETH, Dentition
+from components.settings import CASE_STORE_DIR
+from components.teeth_templates import AI_TEMPLATE, MISSING_TEMPLATE, new_dentition
+
+logger = logging.getLogger(__name__)
+
+FLAGS_TYPE = pa.list_(pa.uint8(), len(FDI_TEETH))
+FLAG_COLUMNS = ("manual", "ai", "corrected")
+
+# One row per submitted case. The flag columns hold all 52 positions in FDI_TEETH order,
+# the scalar columns carry the row-group statistics cohort queries filter on.
+CASE_SCHEMA = pa.schema([
+    ("case_id", pa.string()),
+    ("created_at", pa.timestamp("ms", tz="UTC")),
+    ("submitted_on", pa.string()),
+    ("role", pa.string()),
+    ("profile_number", pa.string()),
+    ("rnumber", pa.string()),
+    ("teeth_kind", pa.string()),
+    ("manual", FLAGS_TYPE),
+    ("ai", FLAGS_TYPE),
+    ("corrected", FLAGS_TYPE),
+    ("corrected_teeth", pa.list_(pa.uint8())),
+    ("differences", pa.uint8()),
+])
+# hive-style directories, submitted_on=2025-05-20/...
+PARTITIONING = ds.partitioning(pa.schema([("submitted_on", pa.string())]), flavor="hive")
+# teeth that count for the differences column, mixed cases use both sets
+TEETH_BY_KIND = {"Adult": ADULT_TEETH, "Child": CHILD_TEETH}
+# compact_cases rewrites a day's small files into one, sorted so role and created_at row-group
+# statistics let filters skip whole row groups
+COMPACT_SORT = [("role", "ascending"), ("created_at", "ascending")]
+ROW_GROUP_ROWS = 64 * 1024
+
+
+def case_record(manual: Dentition, ai: Dentition, corrected: Dentition, role: str, corrected_teeth=(),
+                profile_number=None, rnumber=None, teeth_kind=None, created_at: datetime | None = None) -> dict:
+    created_at = created_at or datetime.now(timezone.utc)
+    return {
+        "case_id": uuid.uuid4().hex,
+        "created_at": created_at,
+        "submitted_on": created_at.date().isoformat(),
+        "role": role,
+        "profile_number": profile_number or None,
+        "rnumber": rnumber or None,
+        "teeth_kind": teeth_kind,
+        "manual": manual.flags.tolist(),
+        "ai": ai.flags.tolist(),
+        "corrected": corrected.flags.tolist(),
+        "corrected_teeth": sorted(corrected_teeth),
+        "differences": int(compare_dentitions(manual, ai, TEETH_BY_KIND.get(teeth_kind, FDI_TEETH)).mask.sum()),
+    }
+
+
+def append_cases(records: list[dict], root: str | None = None):
+    # every call adds new files to the dataset, nothing that is already there is rewritten
+    if not records:
+        return
+    table = pa.Table.from_pylist(records, schema=CASE_SCHEMA).sort_by("created_at")
+    ds.write_dataset(table, root or CASE_STORE_DIR, format="parquet", partitioning=PARTITIONING,
+                     basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                     existing_data_behavior="overwrite_or_ignore")
+
+
+def compact_cases(root: str | None = None, before: str | None = None, row_group_rows: int = ROW_GROUP_ROWS) -> int:
+    """Merge the one-file-per-save parts of every day before ``before`` (default: today, UTC) into one file.
+
+    Today's partition is left alone, the app is still appending to it. Returns the number of partitions rewritten.
+    """
+    root = root or CASE_STORE_DIR
+    before = before or datetime.now(timezone.utc).date().isoformat()
+    compacted = 0
+    for partition in sorted(glob.glob(os.path.join(root, "submitted_on=*"))):
+        day = partition.split("=", 1)[1]
+        parts = sorted(glob.glob(os.path.join(partition, "*.parquet")))
+        if day >= before or len(parts) < 2:
+            continue
+        # the partition column lives in the directory name, not in the files
+        table = pq.read_table(parts, schema=CASE_SCHEMA.remove(CASE_SCHEMA.get_field_index("submitted_on")))
+        # dataset discovery skips dot files, so the new file only shows up once it is complete;
+        # until the old parts are removed a reader may briefly see the day twice
+        tmp_path = os.path.join(partition, f".compact-{uuid.uuid4().hex}")
+        pq.write_table(table.sort_by(COMPACT_SORT), tmp_path, row_group_size=row_group_rows)
+        os.replace(tmp_path, os.path.join(partition, f"part-{uuid.uuid4().hex}-0.parquet"))
+        for part in parts:
+            os.remove(part)
+        compacted += 1
+    return compacted
+
+
+def case_dataset(root: str | None = None) -> ds.Dataset:
+    return ds.dataset(root or CASE_STORE_DIR, schema=CASE_SCHEMA, format="parquet", partitioning=PARTITIONING)
+
+
+def load_cases(filter=None, columns=None, root: str | None = None) -> pa.Table:
+    """Cases matching ``filter``, e.g. ``(ds.field("role") == "student") & (ds.field("submitted_on") >= "2025-05-01")``.
+
+    Partitions and row groups whose statistics can't match are skipped without being read.
+    """
+    return case_dataset(root).to_table(filter=filter, columns=columns)
+
+
+def case_flags(cases: pa.Table, column: str) -> np.ndarray:
+    # (cases, 52) uint8 flags of one of FLAG_COLUMNS, ready for compare_dentitions/agreement_stats
+    values = cases.column(column).combine_chunks().flatten()
+    return values.to_numpy(zero_copy_only=False).reshape(-1, len(FDI_TEETH))
+
+
+def _session_dentition(session, keys, template: Dentition) -> Dentition:
+    # the adult and child teeth of a page can be views on different arrays, merge them into one
+    dentition = new_dentition(template)
+    for key in keys:
+        teeth = session.get(key)
+        if teeth is not None:
+            dentition.update(teeth)
+    return dentition
+
+
+def snapshot_manual(session) -> Dentition:
+    # the manual findings as submitted, before the comparison page corrects them
+    return _session_dentition(session, ("teeth_dict_manual", "childteeth_dict_manual"), MISSING_TEMPLATE)
+
+
+def case_from_session(session) -> dict | None:
+    if not session.get("submitted_manual_teeth") or session.get("case_saved"):
+        return None
+    corrected = snapshot_manual(session)
+    manual = session.get("submitted_manual") or corrected
+    ai = _session_dentition(session, ("ai_teeth", "ai_teeth_child"), AI_TEMPLATE)
+    return case_record(manual, ai, corrected,
+                       role="professional" if session.get("Professional") else "student",
+                       corrected_teeth=session.get("corrected_teeth", ()),
+                       profile_number=session.get("profile_number"),
+                       rnumber=session.get("rnumber"),
+                       teeth_kind=session.get("Teethkind"))
+
+
+def save_session_case(session) -> bool:
+    """Persist the session's case before the session is cleared. Never raises, losing a case beats losing the restart."""
+    try:
+        record = case_from_session(session)
+        if record is None:
+            return False
+        append_cases([record])
+        session["case_saved"] = True
+        return True
+    except Exception:
+        logger.exception("could not save case")
+        return False
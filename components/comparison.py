@@ -0,0 +1,88 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+from components.dentition import FDI_TEETH, Dentition
+from components.tooth_status import ToothFlag, parse_status
+
+FLAG_COUNT = len(ToothFlag)
+
+
+@dataclass(frozen=True)
+class DentitionDiff:
+    """Result of compare_dentitions.
+
+    ``mask`` is ``(..., teeth)``: True where the statuses differ.
+    ``disagreement`` is ``(..., teeth, flags)``: True where one side has a flag
+    the other doesn't, flags in ToothFlag order. The leading axis is only there
+    when stacks of dentitions were compared.
+    """
+    teeth: tuple
+    mask: np.ndarray
+    disagreement: np.ndarray
+
+    def differing_teeth(self, index: int | None = None) -> list[int]:
+        mask = self.mask if index is None else self.mask[index]
+        if mask.ndim != 1:
+            raise ValueError("pass the index of the dentition pair when comparing stacks")
+        return [self.teeth[i] for i in np.flatnonzero(mask)]
+
+    def flag_mask(self, flag: ToothFlag) -> np.ndarray:
+        # (..., teeth) disagreement matrix of a single flag
+        return self.disagreement[..., flag.bit_length() - 1]
+
+    def flag_counts(self) -> dict[ToothFlag, int]:
+        counts = self.disagreement.reshape(-1, FLAG_COUNT).sum(axis=0)
+        return {flag: int(count) for flag, count in zip(ToothFlag, counts)}
+
+
+def flag_array(teeth, tooth_numbers=None) -> tuple[np.ndarray, tuple]:
+    """uint8 flags of one dentition (1-D) or a stack of them (2-D), and the FDI numbers of the last axis.
+
+    Accepts a Dentition, a ``{tooth: status}`` mapping, a sequence of either,
+    or an array of flags whose last axis follows ``tooth_numbers``.
+    """
+    if isinstance(teeth, Dentition):
+        if tooth_numbers is None or tuple(tooth_numbers) == teeth.teeth:
+            return teeth.flags, teeth.teeth
+    if isinstance(teeth, Mapping):
+        numbers = tuple(tooth_numbers) if tooth_numbers is not None else tuple(teeth)
+        flags = np.fromiter((parse_status(teeth.get(n)) for n in numbers), dtype=np.uint8, count=len(numbers))
+        return flags, numbers
+    if isinstance(teeth, np.ndarray):
+        numbers = tuple(tooth_numbers) if tooth_numbers is not None else FDI_TEETH
+        if teeth.shape[-1] != len(numbers):
+            raise ValueError(f"flag array has {teeth.shape[-1]} teeth, expected {len(numbers)}")
+        return teeth.astype(np.uint8, copy=False), numbers
+
+    # a stack of dentitions, every one is laid out like the first
+    stack = list(teeth)
+    if not stack:
+        raise ValueError("can't compare an empty stack of dentitions")
+    first, numbers = flag_array(stack[0], tooth_numbers)
+    rows = [first] + [flag_array(item, numbers)[0] for item in stack[1:]]
+    return np.stack(rows), numbers
+
+
+def normalize_status(status) -> ToothFlag:
+    # scalar version of normalize_flags
+    return parse_status(status) or ToothFlag.NORMAL
+
+
+def normalize_flags(flags: np.ndarray) -> np.ndarray:
+    # no status and "normal" are the same thing: an untouched, present tooth
+    return np.where(flags == 0, np.uint8(ToothFlag.NORMAL), flags).astype(np.uint8, copy=False)
+
+
+def compare_dentitions(a, b, tooth_numbers=None) -> DentitionDiff:
+    """Compare two dentitions, or two equally long stacks of dentitions, in one NumPy pass."""
+    a_flags, numbers = flag_array(a, tooth_numbers)
+    b_flags, _ = flag_array(b, numbers)
+    if a_flags.shape != b_flags.shape:
+        raise ValueError(f"can't compare dentitions of shape {a_flags.shape} and {b_flags.shape}")
+
+    changed = normalize_flags(a_flags) ^ normalize_flags(b_flags)
+    # one column per ToothFlag bit, lowest bit (NORMAL) first
+    disagreement = np.unpackbits(changed[..., None], axis=-1, bitorder="little").astype(bool)
+    return DentitionDiff(numbers, changed != 0, disagreement)
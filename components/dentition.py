@@ -0,0 +1,120 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+from components.tooth_status import NO_STATUS, ToothFlag, format_status, parse_status
+
+ADULT_TEETH = tuple(q + n for q in (10, 20, 30, 40) for n in range(1, 9))
+CHILD_TEETH = tuple(q + n for q in (50, 60, 70, 80) for n in range(1, 6))
+# every FDI position, adult teeth first so both sets are contiguous slices of the array
+FDI_TEETH = ADULT_TEETH + CHILD_TEETH
+
+# FDI number -> array index, -1 for numbers that aren't a tooth
+FDI_INDEX = tuple(FDI_TEETH.index(n) if n in FDI_TEETH else -1 for n in range(max(FDI_TEETH) + 1))
+
+ADULT_SLICE = slice(0, len(ADULT_TEETH))
+CHILD_SLICE = slice(len(ADULT_TEETH), len(FDI_TEETH))
+
+
+class Dentition(Mapping):
+    """Tooth statuses of all 52 FDI positions in one uint8 array of ToothFlag bits.
+
+    Behaves like the ``dict[int, ToothFlag]`` the pages used to keep: indexing
+    by FDI number, ``items()``, ``get()`` and assignment of a ToothFlag or a
+    "normal,df" string. ``adult`` and ``child`` are views that share the array,
+    so writes through a view show up in the full dentition.
+    """
+
+    __slots__ = ("flags", "_start", "_teeth")
+
+    def __init__(self, teeth: Mapping | None = None):
+        self.flags = np.zeros(len(FDI_TEETH), dtype=np.uint8)
+        self._start = 0
+        self._teeth = FDI_TEETH
+        if teeth:
+            self.update(teeth)
+
+    @classmethod
+    def _view(cls, flags: np.ndarray, start: int, teeth: tuple) -> "Dentition":
+        view = cls.__new__(cls)
+        view.flags = flags
+        view._start = start
+        view._teeth = teeth
+        return view
+
+    @property
+    def teeth(self) -> tuple:
+        # FDI numbers in array order
+        return self._teeth
+
+    @property
+    def adult(self) -> "Dentition":
+        return self._subset(ADULT_SLICE, ADULT_TEETH)
+
+    @property
+    def child(self) -> "Dentition":
+        return self._subset(CHILD_SLICE, CHILD_TEETH)
+
+    def _subset(self, part: slice, teeth: tuple) -> "Dentition":
+        if len(self._teeth) != len(FDI_TEETH):
+            raise ValueError("adult/child views can only be taken from a full dentition")
+        # basic slicing returns a numpy view, nothing is copied
+        return self._view(self.flags[part], part.start, teeth)
+
+    def _position(self, tooth_number) -> int:
+        try:
+            index = FDI_INDEX[tooth_number] - self._start if tooth_number >= 0 else -1
+        except (IndexError, TypeError):
+            raise KeyError(tooth_number) from None
+        if not 0 <= index < len(self._teeth):
+            raise KeyError(tooth_number)
+        return index
+
+    def __getitem__(self, tooth_number) -> ToothFlag:
+        return ToothFlag(int(self.flags[self._position(tooth_number)]))
+
+    def __setitem__(self, tooth_number, status):
+        self.flags[self._position(tooth_number)] = parse_status(status)
+
+    def __contains__(self, tooth_number) -> bool:
+        try:
+            self._position(tooth_number)
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self._teeth)
+
+    def __len__(self) -> int:
+        return len(self._teeth)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def update(self, teeth: Mapping):
+        for tooth_number, status in teeth.items():
+            self[tooth_number] = status
+
+    def fill(self, status):
+        self.flags[:] = parse_status(status)
+
+    def clear(self):
+        self.fill(NO_STATUS)
+
+    def copy(self) -> "Dentition":
+        # always writable, also when copying a frozen template
+        return self._view(self.flags.copy(), self._start, self._teeth)
+
+    def freeze(self) -> "Dentition":
+        # read-only from here on, writes raise ValueError (views share the flag)
+        self.flags.setflags(write=False)
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        return not self.flags.flags.writeable
+
+    def to_dict(self) -> dict[int, str | None]:
+        # the input/teethSet.py format
+        return {tooth: format_status(int(flags)) for tooth, flags in zip(self._teeth, self.flags)}
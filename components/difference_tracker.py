@@ -0,0 +1,73 @@
+import streamlit as st
+
+from components.comparison import compare_dentitions, normalize_status
+from components.tooth_status import ToothFlag
+
+TRACKERS_KEY = "difference_trackers"
+
+
+class DifferenceTracker:
+    """Differences between the manual and the AI teeth of one view (adult or child).
+
+    The full comparison runs once, after that every edit updates a single
+    tooth. ``version`` goes up whenever the differences, the corrected teeth
+    or a tracked status change, so derived output can be cached against it.
+    """
+
+    def __init__(self, manual, ai, corrected: set | None = None):
+        self.manual = manual
+        self.ai = ai
+        self.corrected = corrected if corrected is not None else set()
+        self.differences = set(compare_dentitions(manual, ai, tuple(ai)).differing_teeth())
+        self.version = 0
+        self._pending = (-1, {})
+
+    def tracks(self, manual, ai) -> bool:
+        return self.manual is manual and self.ai is ai
+
+    def tooth_changed(self, teeth, tooth_number: int) -> bool:
+        if (teeth is not self.manual and teeth is not self.ai) or tooth_number not in self.ai:
+            return False
+        if normalize_status(self.manual.get(tooth_number)) != normalize_status(self.ai[tooth_number]):
+            self.differences.add(tooth_number)
+        else:
+            self.differences.discard(tooth_number)
+        self.version += 1
+        return True
+
+    def mark_corrected(self, tooth_number: int):
+        # the corrected set is shared by the adult and child trackers, another one may have added the tooth already
+        added = tooth_number not in self.corrected
+        self.corrected.add(tooth_number)
+        if tooth_number in self.ai and (added or tooth_number in self._pending[1]):
+            self.version += 1
+
+    @property
+    def pending(self) -> dict[int, ToothFlag]:
+        # differences that haven't been corrected yet, with the AI status, rebuilt once per version
+        version, pending = self._pending
+        if version != self.version:
+            pending = {tooth: self.ai[tooth] for tooth in sorted(self.differences - self.corrected)}
+            self._pending = (self.version, pending)
+        return pending
+
+
+def get_difference_tracker(manual, ai, view: str) -> DifferenceTracker:
+    trackers = st.session_state.setdefault(TRACKERS_KEY, {})
+    corrected = st.session_state.setdefault("corrected_teeth", set())
+    tracker = trackers.get(view)
+    if tracker is None or not tracker.tracks(manual, ai) or tracker.corrected is not corrected:
+        tracker = trackers[view] = DifferenceTracker(manual, ai, corrected)
+    return tracker
+
+
+def notify_tooth_changed(teeth, tooth_number: int):
+    for tracker in st.session_state.get(TRACKERS_KEY, {}).values():
+        tracker.tooth_changed(teeth, tooth_number)
+
+
+def mark_corrected(tooth_number: int):
+    # the trackers share the session's corrected set, let them add to it so their versions move
+    for tracker in st.session_state.get(TRACKERS_KEY, {}).values():
+        tracker.mark_corrected(tooth_number)
+    st.session_state.setdefault("corrected_teeth", set()).add(tooth_number)
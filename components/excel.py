@@ -1,97 +1,66 @@
 import io
-from typing import Dict, List, Set
+from collections.abc import Mapping
+from typing import Dict, List
 
-import openpyxl
 import pandas as pd
 import streamlit as st
 from openpyxl.utils import get_column_letter
 
+from components.tooth_status import STATUS_FLAGS, ToothFlag, status_tags
 
-def excel_button():
-
-    manual_teeth: Dict[int, str] = st.session_state.get("manual_teeth", {})
-    ai_teeth: Dict[int, str] = st.session_state.get("ai_teeth", {})
-
-    data_sources: List[Dict[int, str]] = [manual_teeth, ai_teeth]
-    source_names: List[str] = ["Manual", "AI"]
-
-    def parse_tags(raw_value: str) -> List[str]:
-        if raw_value is None:
-            return []
-        pieces = [part.strip() for part in raw_value.split(",")]
-        return [p for p in pieces if p]
-
-    all_tags: Set[str] = {"normal"}
-    for src_dict in data_sources:
-        for value in src_dict.values():
-            for tag in parse_tags(value):
-                all_tags.add(tag)
-
-    rows: List[Dict[str, str]] = []
-
-    for src_name, src_dict in zip(source_names, data_sources):
-        row: Dict[str, str] = {"source": src_name}
-
-        # First, check for normal tag as a special case, since both None and normal count as normal
-        normal_keys: List[int] = []
-        for key, value in src_dict.items():
-            parsed = parse_tags(value)
-
-            if not parsed or "normal" in parsed:
-                normal_keys.append(key)
-
-        row["present"] = ", ".join(str(key) for key in normal_keys)
+# spreadsheet headers of the tags that aren't just capitalized
+COLUMN_NAMES = {"df": "dental filling", "rcf": "root canal filling"}
 
-        # Next, check for all other tags
-        for tag in sorted(all_tags):
-            if tag == "normal":
-                continue  # already handled
 
-            keys_with_this_tag: List[int] = []
-            for key, value in src_dict.items():
-                if tag in parse_tags(value):
-                    keys_with_this_tag.append(key)
+def tag_index(teeth: Mapping) -> Dict[str, List[int]]:
+    """tag -> sorted tooth numbers carrying it, in one pass over the teeth.
 
-            row[tag] = ", ".join(str(k) for k in sorted(keys_with_this_tag))
+    Teeth without a status are filed under "normal", both mean an untouched tooth.
+    """
+    index: Dict[str, List[int]] = {}
+    for tooth, flags in sorted(teeth.items()):
+        for tag in status_tags(flags) or ("normal",):
+            index.setdefault(tag, []).append(tooth)
+    return index
 
-        rows.append(row)
 
-    df = pd.DataFrame(rows)
+def overview_frame(sources: Dict[str, Mapping]) -> pd.DataFrame:
+    # one row per source, one column per tag that any source uses ("normal" is left out)
+    indexes = {name: tag_index(teeth) for name, teeth in sources.items()}
+    used_tags = set().union(*indexes.values())
+    tags = ["missing"] + [tag for tag in STATUS_FLAGS if tag not in ("normal", "missing")]
+    tags = [tag for tag in tags if tag in used_tags]
 
-    priority_cols = ["source", "missing"]
-    used_columns = [column for column in priority_cols] + ["normal", "present"]
-    remaining_cols = [tag for tag in all_tags if tag not in used_columns]
+    rows = [{"source": name, **{tag: ", ".join(map(str, index.get(tag, ()))) for tag in tags}}
+            for name, index in indexes.items()]
+    df = pd.DataFrame(rows, columns=["source", *tags])
+    df.columns = [COLUMN_NAMES.get(col, col).capitalize() for col in df.columns]
+    return df
 
-    final_columns = [col for col in priority_cols if col in df.columns] + remaining_cols
-    df = df.reindex(columns=final_columns)
-
-    df = df.rename(columns={"df": "dental filling", "rcf": "root canal filling"})
-
-    df.columns = [col.capitalize() for col in df.columns]
 
+def overview_excel(manual_teeth: Mapping, ai_teeth: Mapping) -> io.BytesIO:
+    df = overview_frame({"Manual": manual_teeth, "AI": ai_teeth})
     buffer = io.BytesIO()
-
     with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
         df.to_excel(writer, sheet_name="Overview", index=False)
+        worksheet = writer.book["Overview"]
 
-        worksheet: openpyxl.worksheet.worksheet.Worksheet = writer.book["Overview"]
+        # the widest cell of a column is its header or its longest tooth list, both are in the frame already
+        for position, column in enumerate(df.columns, start=1):
+            max_length = max([len(column), *map(len, df[column])])
+            worksheet.column_dimensions[get_column_letter(position)].width = max_length + 5
 
-        for column in worksheet.columns:
-            max_length = 0
-            for cell in column:
-                cell_value = "" if cell.value is None else str(cell.value)
-                max_length = max(max_length, len(cell_value))
+    # rewind so Streamlit can read the buffer from start
+    buffer.seek(0)
+    return buffer
 
-            # Remove some width to not have too much white space
-            #adjusted_width = max_length - 25
-            adjusted_width = max_length + 5
 
-            column_letter = get_column_letter(column[0].column)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+def excel_button():
 
-    # rewind so Streamlit can read the buffer from start
-    buffer.seek(0)
-    #st.dataframe(df)
+    manual_teeth: Dict[int, ToothFlag] = st.session_state.get("manual_teeth", {})
+    ai_teeth: Dict[int, ToothFlag] = st.session_state.get("ai_teeth", {})
+
+    buffer = overview_excel(manual_teeth, ai_teeth)
     st.download_button(
         label="Download Excel file",
         data=buffer,
@@ -0,0 +1,52 @@
+import hashlib
+from collections.abc import Mapping
+from typing import Callable
+
+import streamlit as st
+
+from components.dentition import Dentition
+
+EXPORTS_KEY = "export_cache"
+
+
+def _hash_part(part) -> bytes:
+    if isinstance(part, (bytes, bytearray, memoryview)):
+        return bytes(part)
+    if isinstance(part, Dentition):
+        # the flags plus the first FDI number, so the adult and child views of one array differ
+        return part.flags.tobytes() + repr(part.teeth[:1]).encode()
+    if isinstance(part, Mapping):
+        return repr(sorted(part.items())).encode()
+    return repr(part).encode()
+
+
+def content_hash(*parts) -> str:
+    """Digest of everything an export is built from: teeth, patient metadata, image bytes."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        data = _hash_part(part)
+        # length-prefixed, so the boundaries between parts can't shift
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def cached_export(name: str, key: str) -> bytes | None:
+    # one entry per export, only valid while the content hash matches
+    cached = st.session_state.get(EXPORTS_KEY, {}).get(name)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    return None
+
+
+def store_export(name: str, key: str, data: bytes):
+    st.session_state.setdefault(EXPORTS_KEY, {})[name] = (key, data)
+
+
+def memoized_export(name: str, key: str, build: Callable[[], bytes]) -> bytes:
+    # reruns with unchanged content reuse the bytes, any change rebuilds once
+    data = cached_export(name, key)
+    if data is None:
+        data = build()
+        store_export(name, key, data)
+    return data
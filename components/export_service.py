@@ -0,0 +1,208 @@
+import atexit
+import os
+import socket
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from multiprocessing.connection import Connection
+from typing import Callable
+
+import streamlit as st
+
+from components.export_cache import cached_export, memoized_export, store_export
+from components.settings import EXPORT_WORKERS
+
+# finished jobs kept around for other sessions asking for the same export
+MAX_FINISHED_JOBS = 16
+POLL_SECONDS = 0.5
+# how long a stopping worker host gets to exit before it is killed
+HOST_EXIT_SECONDS = 10
+
+
+def scaled_progress(report, start: float, end: float):
+    # for builders made of steps: maps a step's 0..1 onto start..end of the whole job
+    if report is None:
+        return None
+    return lambda fraction: report(start + (end - start) * fraction)
+
+
+class ExportJob:
+    """Handle of one export, the page polls ``status`` and ``progress``."""
+
+    def __init__(self, key):
+        self.key = key
+        self.status = "queued"
+        self.progress = 0.0
+        self.error = None
+        self.data = None
+        # connection of the worker host building the job
+        self._host = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def _set_progress(self, fraction: float):
+        if not self.done:
+            self.status = "running"
+            self.progress = max(self.progress, min(fraction, 1.0))
+
+    def _finish(self, data: bytes | None, error: str | None):
+        if error is not None:
+            self.error = error
+            self.status = "failed"
+        else:
+            self.data = data
+            self.status = "done"
+            self.progress = 1.0
+
+
+class ExportService:
+    """Builds exports in worker processes so the script thread never blocks on reportlab.
+
+    Jobs are keyed by their content hash: submitting a key that is queued, running or
+    recently finished returns the existing handle. With ``workers=0`` jobs are built
+    right away on the calling thread.
+    """
+
+    def __init__(self, workers: int = EXPORT_WORKERS):
+        self.workers = workers
+        self._jobs: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._process = None
+
+    @property
+    def background(self) -> bool:
+        return self.workers > 0
+
+    def _ensure_host(self) -> Connection:
+        if self._conn is not None and self._process.poll() is not None:
+            # the host died, its reader thread fails the jobs it had
+            self._conn = None
+        if self._conn is None:
+            if self._process is None:
+                atexit.register(self.shutdown)
+            # a separate interpreter (components/export_worker.py) owns the worker pool, so no worker
+            # is ever spawned from this process, whose __main__ is whatever page script ran last
+            parent_end, host_end = socket.socketpair()
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "components.export_worker", str(host_end.fileno()), str(self.workers)],
+                pass_fds=(host_end.fileno(),), env=env)
+            host_end.close()
+            self._conn = Connection(parent_end.detach())
+            threading.Thread(target=self._read_results, args=(self._conn, self._process), daemon=True,
+                             name="export-results").start()
+        return self._conn
+
+    def _read_results(self, conn: Connection, process: subprocess.Popen):
+        # one thread per host, it ends when the host closes its end of the socket
+        while True:
+            try:
+                kind, key, value = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                job = self._jobs.get(key)
+                if job is None:
+                    continue
+                if kind == "progress":
+                    job._set_progress(value)
+                else:
+                    job._finish(value if kind == "done" else None, value if kind == "failed" else None)
+        conn.close()
+        with self._lock:
+            if self._conn is conn:
+                self._conn = None
+            # the host stopped with these jobs, the next submit starts a new host and retries them
+            for job in self._jobs.values():
+                if job._host is conn and not job.done:
+                    job._finish(None, "the export worker stopped")
+        _reap(process)
+
+    def get(self, key) -> ExportJob | None:
+        with self._lock:
+            return self._jobs.get(key)
+
+    def submit(self, key, build: Callable[..., bytes], kwargs: dict) -> ExportJob:
+        """Queue ``build(**kwargs, progress=...)``, a module-level function so it can be sent to a worker."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status != "failed":
+                self._jobs.move_to_end(key)
+                return job
+            job = self._jobs[key] = ExportJob(key)
+            self._trim()
+
+        if not self.background:
+            try:
+                job._finish(build(**kwargs, progress=job._set_progress), None)
+            except Exception as e:
+                job._finish(None, str(e) or type(e).__name__)
+            return job
+
+        with self._lock:
+            job._host = self._ensure_host()
+            job._host.send((key, build, kwargs))
+        return job
+
+    def _trim(self):
+        finished = [key for key, job in self._jobs.items() if job.done]
+        for key in finished[:max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+            del self._jobs[key]
+
+    def shutdown(self):
+        with self._lock:
+            conn, process = self._conn, self._process
+            self._conn = None
+        if conn is not None:
+            try:
+                # sentinel: the host stops its pool and closes the socket, which ends the reader thread
+                conn.send(None)
+            except OSError:
+                pass
+        if process is not None:
+            _reap(process)
+
+
+def _reap(process: subprocess.Popen):
+    # wait for a stopping host so it doesn't linger as a zombie, kill it if it doesn't exit
+    try:
+        process.wait(timeout=HOST_EXIT_SECONDS)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+export_service = ExportService()
+
+
+def export_download_button(name: str, key: str, build: Callable[..., bytes], kwargs: dict, *,
+                           label: str, file_name: str, mime: str):
+    """Download button for an export, built in the background the first time its content is seen."""
+    data = cached_export(name, key)
+    if data is None and not export_service.background:
+        data = memoized_export(name, key, lambda: build(**kwargs))
+    if data is not None:
+        st.download_button(label=label, data=data, file_name=file_name, mime=mime)
+        return
+
+    export_service.submit((name, key), build, kwargs)
+    _export_progress(name, key, file_name)
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _export_progress(name: str, key: str, file_name: str):
+    # only this fragment reruns while the export is built, the rest of the page stays usable
+    job = export_service.get((name, key))
+    if job is None or job.status == "done":
+        if job is not None:
+            store_export(name, key, job.data)
+        # the full rerun shows the download button (or submits again if the job was dropped)
+        st.rerun()
+    if job.status == "failed":
+        st.error(f"Could not create the export: {job.error}")
+        return
+    st.progress(job.progress, text=f"Preparing {file_name}...")
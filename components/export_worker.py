@@ -0,0 +1,107 @@
+# Host of the export worker processes, started by components/export_service.py as
+#   python -m components.export_worker <socket fd> <workers>
+# It runs as its own interpreter with this plain module as __main__, so the processes it spawns
+# never import the page script that the Streamlit process last ran as __main__.
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import Connection
+from typing import Callable
+
+# set in the worker processes, carries (job key, progress) back to the host
+_progress_queue = None
+
+
+def _init_worker(queue):
+    global _progress_queue
+    _progress_queue = queue
+    threading.Thread(target=_exit_with_host, daemon=True, name="host-watch").start()
+
+
+def _exit_with_host():
+    # a killed host can't shut its pool down, the workers must not outlive it
+    multiprocessing.parent_process().join()
+    os._exit(1)
+
+
+def _run_job(key, build: Callable[..., bytes], kwargs: dict) -> bytes:
+    # runs in a worker process
+    return build(**kwargs, progress=lambda fraction: _progress_queue.put((key, fraction)))
+
+
+class _Host:
+    def __init__(self, conn: Connection, workers: int):
+        self.conn = conn
+        self.workers = workers
+        self._send_lock = threading.Lock()
+        self._context = multiprocessing.get_context("spawn")
+        self._queue = self._context.Queue()
+        self._pool = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(self.workers, mp_context=self._context,
+                                   initializer=_init_worker, initargs=(self._queue,))
+
+    def send(self, message):
+        with self._send_lock:
+            try:
+                self.conn.send(message)
+            except OSError:
+                # the Streamlit process is gone or shutting the host down
+                pass
+
+    def _forward_progress(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            self.send(("progress", *item))
+
+    def _finish(self, key, future):
+        if future.cancelled():
+            return
+        try:
+            self.send(("done", key, future.result()))
+        except Exception as e:
+            self.send(("failed", key, str(e) or type(e).__name__))
+
+    def submit(self, key, build, kwargs):
+        try:
+            future = self._pool.submit(_run_job, key, build, kwargs)
+        except BrokenProcessPool:
+            # a worker died (e.g. out of memory), start over with a fresh pool
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._new_pool()
+            future = self._pool.submit(_run_job, key, build, kwargs)
+        future.add_done_callback(lambda done: self._finish(key, done))
+
+    def serve(self):
+        forwarder = threading.Thread(target=self._forward_progress, name="export-progress")
+        forwarder.start()
+        try:
+            while True:
+                try:
+                    message = self.conn.recv()
+                except EOFError:
+                    # the Streamlit process is gone
+                    break
+                if message is None:
+                    break
+                self.submit(*message)
+        finally:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._queue.put(None)
+            forwarder.join()
+            self.conn.close()
+
+
+def main():
+    fd, workers = int(sys.argv[1]), int(sys.argv[2])
+    _Host(Connection(fd), workers).serve()
+
+
+if __name__ == "__main__":
+    main()
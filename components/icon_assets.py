@@ -0,0 +1,116 @@
+import glob
+import json
+import os
+
+from PIL import Image
+
+from components.icon_store import SOURCE_HEIGHT, get_icon_store
+
+ICON_VARIANT_DIRS = {
+    "black": "icons",
+    "white": "icons_white_scaled",
+}
+
+# Pre-scaled tooth icons are written here by scripts/prebuild_icons.py
+PRESCALED_ROOT = os.path.join("static", "icons")
+STATIC_URL_PREFIX = "app/static"
+PRESCALED_MANIFEST = os.path.join(PRESCALED_ROOT, "manifest.json")
+MANIFEST_SCHEMA = 1
+
+
+def prescaled_key(icon_variant: str, height: int, icon_path: str) -> str:
+    return f"{icon_variant}/{height}/{icon_path}"
+
+
+# manifest path -> (file signature, parsed manifest), re-read whenever scripts/prebuild_icons.py rewrites it
+_manifests: dict = {}
+
+
+def load_manifest(manifest_path: str = PRESCALED_MANIFEST) -> dict | None:
+    # a missing or unusable manifest is not cached: the prebuild may still be running
+    try:
+        stat = os.stat(manifest_path)
+    except OSError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _manifests.get(manifest_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("schema") != MANIFEST_SCHEMA:
+        return None
+    _manifests[manifest_path] = (signature, manifest)
+    return manifest
+
+
+def prescaled_path(icon_variant: str, height: int, icon_path: str) -> str | None:
+    manifest = load_manifest()
+    if manifest is None:
+        return None
+    key = prescaled_key(icon_variant, height, icon_path)
+    if key not in manifest["files"]:
+        return None
+    return os.path.join(PRESCALED_ROOT, manifest["version"], key)
+
+
+def static_icon_url(icon_variant: str, height: int, icon_path: str):
+    # (url, (w, h)) of a pre-scaled icon under ./static, or None if it wasn't prebuilt
+    manifest = load_manifest()
+    if manifest is None:
+        return None
+    key = prescaled_key(icon_variant, height, icon_path)
+    size = manifest["files"].get(key)
+    if size is None:
+        return None
+    # the version is part of the path, ?v= makes Streamlit send a long-lived Cache-Control header
+    version = manifest["version"]
+    return f"{STATIC_URL_PREFIX}/icons/{version}/{key}?v={version}", tuple(size)
+
+
+def resize_icon(img: Image.Image, height: int) -> Image.Image:
+    # Keep the aspect ratio, the width follows from the requested height
+    w, h = img.size
+    new_w = int(w * (height / h))
+    return img.resize((new_w, height))
+
+
+def load_icon(source_path: str, icon_variant: str, height: int, icon_path: str) -> Image.Image:
+    store = get_icon_store()
+    if store is not None:
+        img = store.get_icon(icon_variant, height, icon_path)
+        if img is not None:
+            return img
+        source = store.get_icon(icon_variant, SOURCE_HEIGHT, icon_path)
+        if source is not None:
+            return resize_icon(source, height)
+
+    prescaled = prescaled_path(icon_variant, height, icon_path)
+    if prescaled is not None:
+        try:
+            with Image.open(prescaled) as img:
+                img.load()
+                return img
+        except OSError:
+            pass
+
+    # height isn't in the manifest (or the asset is gone): resize on the fly
+    with Image.open(source_path) as img:
+        return resize_icon(img, height)
+
+
+def source_icon_paths(icon_variant: str) -> list[str]:
+    root = ICON_VARIANT_DIRS[icon_variant]
+    paths = glob.glob(os.path.join(root, "Icon_*", "*.png"))
+    return sorted(os.path.relpath(p, root).replace(os.sep, "/") for p in paths)
+
+
+def load_all_icons(icon_variant: str, height: int) -> dict[str, Image.Image]:
+    root = ICON_VARIANT_DIRS[icon_variant]
+    return {
+        icon_path: load_icon(os.path.join(root, icon_path), icon_variant, height, icon_path)
+        for icon_path in source_icon_paths(icon_variant)
+    }
@@ -0,0 +1,42 @@
+import base64
+from io import BytesIO
+
+from PIL import Image
+
+# Encodings for tooth icons that leave the process as bytes (data URLs).
+# name -> (mime type, PIL save arguments)
+ENCODINGS = {
+    # lossless, optimize shaves a few percent off at about twice the encode time
+    "png": ("image/png", {"format": "PNG", "optimize": True}),
+    # fastest lossless encode, for bytes that get decoded again right away
+    "png-fast": ("image/png", {"format": "PNG", "compress_level": 1}),
+    # 256-colour palette with alpha, about half the size of "png"
+    "png8": ("image/png", {"format": "PNG", "optimize": True}),
+    # lossy WebP with full alpha, the smallest payload every current browser understands
+    "webp": ("image/webp", {"format": "WEBP", "quality": 90, "method": 4}),
+}
+
+
+def mime_type(encoding: str) -> str:
+    if encoding not in ENCODINGS:
+        raise ValueError(f"unknown icon encoding {encoding!r}, expected one of {sorted(ENCODINGS)}")
+    return ENCODINGS[encoding][0]
+
+
+def quantize_rgba(img: Image.Image, colors: int = 256) -> Image.Image:
+    # FASTOCTREE is the only built-in quantizer that keeps the alpha channel
+    return img.convert("RGBA").quantize(colors=colors, method=Image.Quantize.FASTOCTREE)
+
+
+def encode_image(img: Image.Image, encoding: str = "png") -> bytes:
+    mime_type(encoding)
+    _, save_args = ENCODINGS[encoding]
+    if encoding == "png8":
+        img = quantize_rgba(img)
+    buffer = BytesIO()
+    img.save(buffer, **save_args)
+    return buffer.getvalue()
+
+
+def to_data_url(data: bytes, encoding: str = "png") -> str:
+    return f"data:{mime_type(encoding)};base64,{base64.b64encode(data).decode()}"
@@ -0,0 +1,141 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from io import BytesIO
+
+from PIL import Image
+
+# Single packed file with every tooth icon, written by scripts/prebuild_icons.py.
+# Layout: magic, u32 header length, JSON header, then 64-byte aligned blobs.
+# Pre-scaled icons are stored as raw RGBA pixels so lookups can wrap the mapped
+# memory without decoding or copying; the full-size sources are stored as PNG.
+ICON_STORE_PATH = os.path.join("build", "icons.pack")
+MAGIC = b"TOOTHPK1"
+ALIGNMENT = 64
+SOURCE_HEIGHT = 0  # height used for the full-resolution source icon
+
+
+def store_key(icon_variant: str, height: int, icon_dir: str, tooth_number: int) -> str:
+    return f"{icon_variant}/{height}/{icon_dir}/{tooth_number}"
+
+
+def split_icon_path(icon_path: str) -> tuple[str, int]:
+    # "Icon_df/16.png" -> ("Icon_df", 16)
+    icon_dir, file_name = icon_path.split("/")
+    return icon_dir, int(os.path.splitext(file_name)[0])
+
+
+def write_icon_store(path: str, images, version: str) -> int:
+    # images: iterable of (icon_variant, height, icon_path, PIL image or PNG bytes)
+    blobs = []
+    entries = {}
+    offset = 0
+    for icon_variant, height, icon_path, image in images:
+        icon_dir, tooth_number = split_icon_path(icon_path)
+        if isinstance(image, bytes):
+            with Image.open(BytesIO(image)) as img:
+                width, img_height = img.size
+            data, mode, encoding = image, "", "png"
+        else:
+            rgba = image.convert("RGBA")
+            width, img_height = rgba.size
+            data, mode, encoding = rgba.tobytes(), "RGBA", "raw"
+        entries[store_key(icon_variant, height, icon_dir, tooth_number)] = [
+            offset, len(data), width, img_height, mode, encoding]
+        blobs.append(data)
+        offset += len(data)
+        offset += -offset % ALIGNMENT
+        blobs.append(b"\0" * (-len(data) % ALIGNMENT))
+
+    header = json.dumps({"version": version, "entries": entries}).encode("utf-8")
+    data_start = len(MAGIC) + 4 + len(header)
+    data_start += -data_start % ALIGNMENT
+
+    tmp_path = path + ".tmp"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_start - f.tell()))
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return len(entries)
+
+
+class IconStore:
+    """Read-only view of a packed icon file, memory-mapped once per process."""
+
+    def __init__(self, path: str = ICON_STORE_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a packed icon store")
+        (header_len,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mmap[header_start:header_start + header_len])
+        self.version = header["version"]
+        self.entries = header["entries"]
+        data_start = header_start + header_len
+        self._data_start = data_start + (-data_start % ALIGNMENT)
+        self._view = memoryview(self._mmap)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.entries
+
+    def get_bytes(self, key: str) -> memoryview | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        offset, length = entry[0], entry[1]
+        start = self._data_start + offset
+        return self._view[start:start + length]
+
+    def get_image(self, key: str) -> Image.Image | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        data = self.get_bytes(key)
+        _, _, width, height, mode, encoding = entry
+        if encoding == "raw":
+            # shares the mapped pages, the image is read-only
+            return Image.frombuffer(mode, (width, height), data, "raw", mode, 0, 1)
+        with Image.open(BytesIO(data)) as img:
+            img.load()
+            return img
+
+    def get_icon(self, icon_variant: str, height: int, icon_path: str) -> Image.Image | None:
+        icon_dir, tooth_number = split_icon_path(icon_path)
+        return self.get_image(store_key(icon_variant, height, icon_dir, tooth_number))
+
+
+# (file signature, store) of ICON_STORE_PATH, reopened whenever scripts/prebuild_icons.py replaces the file
+_store: tuple | None = None
+_store_lock = threading.Lock()
+
+
+def get_icon_store(path: str = ICON_STORE_PATH) -> IconStore | None:
+    # like load_manifest: a missing or unusable store is not cached, it may be built after startup
+    global _store
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    signature = (path, stat.st_mtime_ns, stat.st_size)
+    cached = _store
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with _store_lock:
+        if _store is None or _store[0] != signature:
+            try:
+                store = IconStore(path)
+            except (OSError, ValueError):
+                return None
+            # the previous mapping stays open, images handed out earlier still share its pages
+            _store = (signature, store)
+        return _store[1]
@@ -0,0 +1,13 @@
+import logging
+
+from components.settings import LOG_LEVEL
+
+
+def configure_logging(level: str = LOG_LEVEL):
+    # Streamlit only sets up its own loggers, without a handler the INFO records of components.* are dropped
+    logger = logging.getLogger("components")
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
+    logger.setLevel(level)
@@ -1,17 +1,29 @@
+import hashlib
 import io
 import math
+import threading
+from contextlib import contextmanager
 from datetime import date
 
 import streamlit as st
+from PIL import Image as PILImage
+from reportlab import rl_config
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.utils import ImageReader
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer,
-    Table, HRFlowable, Image, TableStyle
+    Table, HRFlowable, Image, TableStyle, Flowable
 )
-from components.teeth import get_tooth_image
+from components.teeth import get_tooth_image_reader
+from components.comparison import compare_dentitions
+from components.export_cache import content_hash
+from components.export_service import export_download_button
+from components.settings import PDF_IMAGE_DPI
+from components.tooth_cache import ToothImageCache
+from components.tooth_status import ToothFlag
 
 # Constants
 PAGE_W, PAGE_H = letter
@@ -25,33 +37,111 @@ MAX_PANO_H = 2.5 * inch
 TOOTH_H_PT = math.floor(0.4 * inch)
 RASTER_SCALE = 3 # factor to scale PIL images to make them less blurry
 DIFF_IMG_W  = 0.45 * inch
+JPEG_QUALITY = 85
+
+# panoramic X-rays and the signature, resampled to the size they are printed at
+pdf_image_cache = ToothImageCache(max_bytes=32 * 1024 * 1024)
 
 # --- helpers ---
-def make_scaled_image(source_bytes, *, max_w: float, max_h: float) -> Image:
-    source = io.BytesIO(source_bytes)
-    img = Image(source)
-    iw, ih = float(img.imageWidth), float(img.imageHeight)
+_binary_streams_lock = threading.Lock()
+_binary_streams_users = 0
+_saved_use_a85 = None
+
+
+@contextmanager
+def binary_image_streams():
+    # Store image streams as binary while our documents are built. ASCII85 makes every embedded image a
+    # quarter larger and, without reportlab's C accelerator, is pure Python that took most of the build
+    # time (benchmarks/bench_pdf_images.py). rl_config is process-wide: the first build switches it off,
+    # the last one to finish puts back whatever other reportlab users had.
+    global _binary_streams_users, _saved_use_a85
+    with _binary_streams_lock:
+        if _binary_streams_users == 0:
+            _saved_use_a85 = rl_config.useA85
+            rl_config.useA85 = 0
+        _binary_streams_users += 1
+    try:
+        yield
+    finally:
+        with _binary_streams_lock:
+            _binary_streams_users -= 1
+            if _binary_streams_users == 0:
+                rl_config.useA85 = _saved_use_a85
+
+
+def make_scaled_image(source_bytes, *, max_w: float, max_h: float, dpi: int = PDF_IMAGE_DPI) -> Image:
+    with PILImage.open(io.BytesIO(source_bytes)) as source:
+        iw, ih = source.size
     scale = min(max_w/iw, max_h/ih, 1.0)
-    img.drawWidth  = iw * scale
-    img.drawHeight = ih * scale
+    draw_w, draw_h = iw * scale, ih * scale
+    # pixels needed to print draw_w x draw_h points at dpi, never more than the source has
+    size = (min(iw, max(1, round(draw_w * dpi / 72))), min(ih, max(1, round(draw_h * dpi / 72))))
+    key = (hashlib.blake2b(source_bytes, digest_size=16).hexdigest(), size)
+    img = Image(io.BytesIO(pdf_image_cache.get_or_create(key, lambda: resample_image(source_bytes, size))))
+    img.drawWidth  = draw_w
+    img.drawHeight = draw_h
     return img
 
-def tooth_image(number: int, status: str, *, height_pt: float = TOOTH_H_PT) -> Image:
+
+def resample_image(source_bytes: bytes, size: tuple[int, int]) -> bytes:
+    source = PILImage.open(io.BytesIO(source_bytes))
+    if source.format == "JPEG" and source.size == size:
+        # already the right size, recompressing would only lose quality
+        return source_bytes
+    # JPEG draft mode decodes at 1/2, 1/4 or 1/8 scale straight away, as long as that stays >= size
+    source.draft(source.mode, size)
+    has_alpha = source.mode in ("RGBA", "LA") or "transparency" in source.info
+    source = source.convert("RGBA" if has_alpha else "L" if source.mode in ("1", "L") else "RGB")
+    source = source.resize(size, PILImage.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    if has_alpha:
+        source.save(buffer, format="PNG")
+    else:
+        # reportlab embeds JPEG bytes as they are, without decoding or recompressing them
+        source.save(buffer, format="JPEG", quality=JPEG_QUALITY)
+    return buffer.getvalue()
+
+class ToothImage(Flowable):
+    """A tooth icon drawn from a shared, cached ImageReader.
+
+    reportlab names image XObjects after a digest of their pixels, so every
+    distinct icon is embedded once per PDF however often it is drawn.
+    """
+
+    def __init__(self, reader: ImageReader, width: float, height: float):
+        super().__init__()
+        self.reader = reader
+        self.drawWidth = width
+        self.drawHeight = height
+
+    def wrap(self, availWidth, availHeight):
+        return self.drawWidth, self.drawHeight
+
+    def draw(self):
+        self.canv.drawImage(self.reader, 0, 0, self.drawWidth, self.drawHeight, mask="auto")
+
+
+def tooth_image(number: int, status: ToothFlag, *, height_pt: float = TOOTH_H_PT) -> ToothImage:
     # Generate a PIL image with higher pixel height for crispness
     height_px = int(height_pt * RASTER_SCALE)
-    pil = get_tooth_image(number, status, height=height_px, icon_variant="white")
-
-    buf = io.BytesIO()
-    pil.save(buf, format="PNG")
-    buf.seek(0)
+    reader = get_tooth_image_reader(number, status, height=height_px, icon_variant="white")
 
-    img = Image(buf)
     # Keep aspect ratio but display at correct height
-    iw_px, ih_px = float(img.imageWidth), float(img.imageHeight)
+    iw_px, ih_px = reader.getSize()
     aspect = iw_px / ih_px or 1.0
-    img.drawHeight = height_pt
-    img.drawWidth  = height_pt * aspect
-    return img
+    return ToothImage(reader, height_pt * aspect, height_pt)
+
+
+def layout_progress(report):
+    # reportlab progress callback -> report(fraction of the story that has been laid out)
+    total = [1]
+
+    def on_progress(kind, value):
+        if kind == "SIZE_EST":
+            total[0] = max(value, 1)
+        elif kind == "PROGRESS":
+            report(min(value / total[0], 1.0))
+    return on_progress
 
 
 # --- main function ---
@@ -69,6 +159,7 @@ def create_pdf(
         *,
         top_row: list[int],
         bottom_row: list[int],
+        progress=None,
 ) -> bytes:
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(
@@ -79,6 +170,8 @@ def create_pdf(
         topMargin=TOP_MARGIN,
         bottomMargin=BOT_MARGIN,
     )
+    if progress is not None:
+        doc.setProgressCallBack(layout_progress(progress))
 
     styles = getSampleStyleSheet()
     center8 = ParagraphStyle("center8", parent=styles["Normal"], fontSize=8, alignment=1)
@@ -167,11 +260,11 @@ def create_pdf(
     story.append(Spacer(1, 12))
 
     # --- full mouth teeth lineup ---
-    def full_lineup(teeth_map: dict[int, str]):
+    def full_lineup(teeth_map: dict[int, ToothFlag]):
         rows: list[list] = []
         rows.append([Paragraph(str(n), center8) for n in top_row])
-        rows.append([tooth_image(n, teeth_map.get(n, "normal")) for n in top_row])
-        rows.append([tooth_image(n, teeth_map.get(n, "normal")) for n in bottom_row])
+        rows.append([tooth_image(n, teeth_map.get(n, ToothFlag.NORMAL)) for n in top_row])
+        rows.append([tooth_image(n, teeth_map.get(n, ToothFlag.NORMAL)) for n in bottom_row])
         rows.append([Paragraph(str(n), center8) for n in bottom_row])
 
         tbl = Table(rows)
@@ -207,11 +300,7 @@ def create_pdf(
     story.append(Spacer(1, 6))
 
     # --- differences ---
-    norm = lambda x: (x or "normal").lower()
-    diffs = [n for n in (*top_row, *bottom_row) if norm(manual_teeth.get(n)) != norm(ai_teeth.get(n))]
-
-    norm = lambda x: (x or "normal").lower()
-    diffs = [n for n in (*top_row, *bottom_row) if norm(manual_teeth.get(n)) != norm(ai_teeth.get(n))]
+    diffs = compare_dentitions(manual_teeth, ai_teeth, (*top_row, *bottom_row)).differing_teeth()
 
     if diffs:
         story.append(Paragraph("Differences", styles["Heading2"]))
@@ -228,8 +317,8 @@ def create_pdf(
 
         # Data row
         for n in diffs:
-            mn_status = manual_teeth.get(n, "normal")
-            ai_status = ai_teeth.get(n, "normal")
+            mn_status = manual_teeth.get(n, ToothFlag.NORMAL)
+            ai_status = ai_teeth.get(n, ToothFlag.NORMAL)
 
             diff_table_data.append([
                 Paragraph(str(n), center8),
@@ -260,7 +349,8 @@ def create_pdf(
         story.append(diff_table)
         story.append(Spacer(1, 12))
 
-    doc.build(story)
+    with binary_image_streams():
+        doc.build(story)
     pdf_bytes = buffer.getvalue()
     buffer.close()
     return pdf_bytes
@@ -310,24 +400,27 @@ def pdf_button():
     stored_gender = st.session_state.get("gender")
     gender = stored_gender if stored_gender else "Unknown"
 
-    pdf_bytes = create_pdf(
+    pano1_bytes = st.session_state["manual_image_bytes"]
+    pano2_bytes = st.session_state["AI_image_bytes"]
+
+    # only rebuilt (in a worker process) when something that ends up in the report changed
+    key = content_hash(rnumber, studentName, patient_id, scandate_str, age, gender,
+                       manual_teeth, ai_teeth, pano1_bytes, pano2_bytes)
+    export_download_button("student_pdf", key, create_pdf, dict(
         rnumber=rnumber,
         student_name=studentName,
         patient_id=patient_id,
         scan_date=scandate_str,
         age=age,
         gender=gender,
-        pano1_bytes=st.session_state["manual_image_bytes"],
-        pano2_bytes=st.session_state["AI_image_bytes"],
+        pano1_bytes=pano1_bytes,
+        pano2_bytes=pano2_bytes,
         manual_teeth=manual_teeth,
         ai_teeth=ai_teeth,
         top_row=top_row,
         bottom_row=bottom_row,
-    )
-
-    st.download_button(
+    ),
         label="📥 Download Report as PDF",
-        data=pdf_bytes,
         file_name="radiology_report.pdf",
         mime="application/pdf",
     )
\ No newline at end of file
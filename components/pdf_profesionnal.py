@@ -12,8 +12,11 @@ from reportlab.platypus import (
     Table, HRFlowable, Image, TableStyle
 )
 
-from components.pdf import make_scaled_image, tooth_image
+from components.export_cache import content_hash
+from components.export_service import export_download_button
+from components.pdf import binary_image_streams, layout_progress, make_scaled_image, tooth_image
 from components.teeth import get_tooth_image
+from components.tooth_status import ToothFlag
 
 # Constants
 PAGE_W, PAGE_H = letter
@@ -44,6 +47,7 @@ def create_pdf_professional(
         top_row: list[int],
         bottom_row: list[int],
         sign_image_bytes: bytes,
+        progress=None,
 ) -> bytes:
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(
@@ -54,6 +58,8 @@ def create_pdf_professional(
         topMargin=TOP_MARGIN,
         bottomMargin=BOT_MARGIN,
     )
+    if progress is not None:
+        doc.setProgressCallBack(layout_progress(progress))
 
     styles = getSampleStyleSheet()
     center8 = ParagraphStyle("center8", parent=styles["Normal"], fontSize=8, alignment=1)
@@ -148,7 +154,7 @@ def create_pdf_professional(
     story.append(Spacer(1, 12))
 
     # --- full mouth teeth lineup ---
-    def full_lineup(teeth_map: dict[int, str], show_numbers: bool):
+    def full_lineup(teeth_map: dict[int, ToothFlag], show_numbers: bool):
         tooth_height = TOOTH_H_PT if show_numbers else TOOTH_H_PT_LARGE
         rows: list[list] = []
         invisible_style = ParagraphStyle('invisible', fontSize=1, alignment=1, textColor=colors.white, leading=1)
@@ -157,8 +163,8 @@ def create_pdf_professional(
         else:
             rows.append([Paragraph("&nbsp;", invisible_style) for n in top_row])
 
-        rows.append([tooth_image(n, teeth_map.get(n, "normal"), height_pt=TOOTH_H_PT_LARGE) for n in top_row])
-        rows.append([tooth_image(n, teeth_map.get(n, "normal"), height_pt=TOOTH_H_PT_LARGE) for n in bottom_row])
+        rows.append([tooth_image(n, teeth_map.get(n, ToothFlag.NORMAL), height_pt=TOOTH_H_PT_LARGE) for n in top_row])
+        rows.append([tooth_image(n, teeth_map.get(n, ToothFlag.NORMAL), height_pt=TOOTH_H_PT_LARGE) for n in bottom_row])
         if show_numbers:
             rows.append([Paragraph(str(n), center8) for n in bottom_row])
         else:
@@ -196,12 +202,12 @@ def create_pdf_professional(
     top_row_present_teeth_left = [
         str(key)
         for key, value in manual_teeth.items()
-        if top_left_row_start <= key <= top_left_row_end and (value is None or "normal" in str(value))
+        if top_left_row_start <= key <= top_left_row_end and (not value or ToothFlag.NORMAL in value)
     ]
     top_row_present_teeth_right = [
         str(key)
         for key, value in manual_teeth.items()
-        if top_right_row_start <= key <= top_right_row_end and (value is None or "normal" in str(value))
+        if top_right_row_start <= key <= top_right_row_end and (not value or ToothFlag.NORMAL in value)
     ]
 
     top_row_present_teeth_left.reverse()
@@ -211,7 +217,7 @@ def create_pdf_professional(
     top_row_missing_teeth = [
         str(key)
         for key, value in manual_teeth.items()
-        if top_left_row_start <= key <= top_right_row_end and "missing" in str(value)
+        if top_left_row_start <= key <= top_right_row_end and ToothFlag.MISSING in value
     ]
 
     bottom_right_row_start = 31
@@ -222,12 +228,12 @@ def create_pdf_professional(
     bottom_row_present_teeth_right = [
         str(key)
         for key, value in manual_teeth.items()
-        if bottom_right_row_start <= key <= bottom_right_row_end and (value is None or "normal" in str(value))
+        if bottom_right_row_start <= key <= bottom_right_row_end and (not value or ToothFlag.NORMAL in value)
     ]
     bottom_row_present_teeth_left = [
         str(key)
         for key, value in manual_teeth.items()
-        if bottom_left_row_start <= key <= bottom_left_row_end and (value is None or "normal" in str(value))
+        if bottom_left_row_start <= key <= bottom_left_row_end and (not value or ToothFlag.NORMAL in value)
     ]
 
     bottom_row_present_teeth_left.reverse()
@@ -236,16 +242,16 @@ def create_pdf_professional(
     bottom_row_missing_teeth = [
         str(key)
         for key, value in manual_teeth.items()
-        if bottom_right_row_start <= key <= bottom_left_row_end and "missing" in str(value)
+        if bottom_right_row_start <= key <= bottom_left_row_end and ToothFlag.MISSING in value
     ]
 
     present_teeth_count = len(top_row_present_teeth) + len(bottom_row_present_teeth)
-    dental_filling_teeth = [str(key) for key, value in manual_teeth.items() if "df" in str(value)]
-    root_canal_filling_teeth = [str(key) for key, value in manual_teeth.items() if "rcf" in str(value)]
-    crown_teeth = [str(key) for key, value in manual_teeth.items() if "crown" in str(value)]
-    bridge_teeth = [str(key) for key, value in manual_teeth.items() if "bridge" in str(value)]
-    implant_teeth = [str(key) for key, value in manual_teeth.items() if "implant" in str(value)]
-    impacted_teeth = [str(key) for key, value in manual_teeth.items() if "impacted" in str(value)]
+    dental_filling_teeth = [str(key) for key, value in manual_teeth.items() if ToothFlag.DF in value]
+    root_canal_filling_teeth = [str(key) for key, value in manual_teeth.items() if ToothFlag.RCF in value]
+    crown_teeth = [str(key) for key, value in manual_teeth.items() if ToothFlag.CROWN in value]
+    bridge_teeth = [str(key) for key, value in manual_teeth.items() if ToothFlag.BRIDGE in value]
+    implant_teeth = [str(key) for key, value in manual_teeth.items() if ToothFlag.IMPLANT in value]
+    impacted_teeth = [str(key) for key, value in manual_teeth.items() if ToothFlag.IMPACTED in value]
     data = [
         Paragraph('The following teeth are missing:'),
         Paragraph(f'Maxilla: {", ".join(top_row_missing_teeth) if top_row_missing_teeth else "-"}'),
@@ -286,7 +292,8 @@ def create_pdf_professional(
     story.append(signtable)
     story.append(Spacer(1, 12))
 
-    doc.build(story)
+    with binary_image_streams():
+        doc.build(story)
     pdf_bytes = buffer.getvalue()
     buffer.close()
     return pdf_bytes
@@ -343,7 +350,10 @@ def pdf_button_professional():
     if not sign_image_bytes:
         print("no image")
 
-    pdf_bytes = create_pdf_professional(
+    # only rebuilt (in a worker process) when something that ends up in the report changed
+    key = content_hash(patient_id, patient_name, scandate_str, birthdate, age, gender, manual_teeth,
+                       manual_image_bytes, sign_image_bytes)
+    export_download_button("professional_pdf", key, create_pdf_professional, dict(
         patient_id=patient_id,
         patient_name=patient_name,
         scan_date=scandate_str,
@@ -355,11 +365,8 @@ def pdf_button_professional():
         top_row=top_row,
         bottom_row=bottom_row,
         sign_image_bytes=sign_image_bytes
-    )
-
-    st.download_button(
+    ),
         label="📥 Download Report as PDF",
-        data=pdf_bytes,
         file_name="radiology_report.pdf",
         mime="application/pdf",
     )
@@ -0,0 +1,32 @@
+import os
+
+# How load_teeth and load_teeth_circle draw the icons:
+# "atlas" references one browser-cached sprite sheet, "image" sends every tooth as its own image,
+# "composite" draws the whole load_teeth chart server-side as a single image (circle view uses "atlas")
+TOOTH_CHART_RENDERER = os.environ.get("TOOTH_CHART_RENDERER", "atlas")
+
+# Where tooth <img> tags point when they aren't drawn from the atlas:
+# "static" uses the pre-scaled icons under ./static (browser-cached), "inline" embeds base64 data URLs
+TOOTH_ICON_SOURCE = os.environ.get("TOOTH_ICON_SOURCE", "static")
+
+# Tooth icon cache warm-up when the server process handles its first script run:
+# "eager" blocks until every icon is cached, "lazy" warms in a background thread, "off" skips it
+ICON_WARMUP = os.environ.get("ICON_WARMUP", "lazy")
+
+# Encoding of tooth icons that are sent to the browser as data URLs (see components/icon_encoding.py),
+# the PDFs hand reportlab the decoded pixels (components/teeth.py get_tooth_image_reader)
+DATA_URL_ICON_ENCODING = os.environ.get("DATA_URL_ICON_ENCODING", "webp")
+
+# Parquet dataset every finished case is appended to (see components/case_store.py),
+# compacted daily by scripts/compact_cases.py
+CASE_STORE_DIR = os.environ.get("CASE_STORE_DIR", os.path.join("data", "cases"))
+
+# Worker processes that build the PDF/ZIP exports in the background (components/export_service.py),
+# 0 builds them on the script thread
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", "2"))
+
+# Resolution the panoramic X-rays and the signature are resampled to before they go into the PDFs
+PDF_IMAGE_DPI = int(os.environ.get("PDF_IMAGE_DPI", "200"))
+
+# Level of the components.* loggers (icon warm-up report, failed case saves, ...), written to stderr
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
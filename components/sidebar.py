@@ -4,7 +4,9 @@ def load_sidebar(page="login"):
     from streamlit_cookies_controller import CookieController
     from datetime import date
     import regex
+    from components.case_store import save_session_case
     def logout():
+        save_session_case(st.session_state)
         controller = CookieController()
         keys_to_clear = [
             "ProfileNumber",
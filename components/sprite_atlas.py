@@ -0,0 +1,142 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from io import BytesIO
+
+from PIL import Image
+
+from components.icon_assets import STATIC_URL_PREFIX, load_all_icons
+from components.tooth_status import resolve_icon_path
+
+logger = logging.getLogger(__name__)
+
+# Atlases live in Streamlit's static folder so the browser fetches each one once
+ATLAS_ROOT = os.path.join("static", "atlas")
+ATLAS_MANIFEST = os.path.join(ATLAS_ROOT, "manifest.json")
+ATLAS_MAX_ROW_WIDTH = 2048
+
+
+# eq=False: atlases are per-process singletons, hashed by identity so they can key caches
+@dataclass(frozen=True, eq=False)
+class SpriteAtlas:
+    url: str
+    width: int
+    height: int
+    # icon path ("Icon_df/16.png") -> (x, y, w, h) inside the atlas
+    index: dict
+
+
+def atlas_name(icon_variant: str, height: int) -> str:
+    return f"{icon_variant}_{height}"
+
+
+def pack_atlas(icons: dict[str, Image.Image], max_row_width: int = ATLAS_MAX_ROW_WIDTH):
+    # Simple shelf packing, every icon of one atlas has the same height
+    index = {}
+    x = y = row_h = atlas_w = 0
+    for icon_path in sorted(icons):
+        w, h = icons[icon_path].size
+        if x and x + w > max_row_width:
+            x = 0
+            y += row_h
+            row_h = 0
+        index[icon_path] = (x, y, w, h)
+        x += w
+        row_h = max(row_h, h)
+        atlas_w = max(atlas_w, x)
+
+    sheet = Image.new("RGBA", (atlas_w, y + row_h), (0, 0, 0, 0))
+    for icon_path, (ix, iy, _, _) in index.items():
+        sheet.paste(icons[icon_path].convert("RGBA"), (ix, iy))
+    return sheet, index
+
+
+def write_atlas(icon_variant: str, height: int, icons: dict[str, Image.Image]) -> dict:
+    sheet, index = pack_atlas(icons)
+    buffer = BytesIO()
+    sheet.save(buffer, format="PNG", optimize=True)
+    data = buffer.getvalue()
+    version = hashlib.sha1(data).hexdigest()[:12]
+
+    file_name = f"{atlas_name(icon_variant, height)}_{version}.png"
+    os.makedirs(ATLAS_ROOT, exist_ok=True)
+    with open(os.path.join(ATLAS_ROOT, file_name), "wb") as f:
+        f.write(data)
+    return {
+        "file": file_name,
+        "version": version,
+        "width": sheet.width,
+        "height": sheet.height,
+        "index": {k: list(v) for k, v in index.items()},
+    }
+
+
+def _to_atlas(entry: dict) -> SpriteAtlas:
+    # the ?v= query makes Streamlit's static handler send a long-lived Cache-Control header
+    url = f"{STATIC_URL_PREFIX}/atlas/{entry['file']}?v={entry['version']}"
+    return SpriteAtlas(url, entry["width"], entry["height"], {k: tuple(v) for k, v in entry["index"].items()})
+
+
+def read_manifest() -> dict:
+    try:
+        with open(ATLAS_MANIFEST, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(entries: dict):
+    os.makedirs(ATLAS_ROOT, exist_ok=True)
+    tmp_path = ATLAS_MANIFEST + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(entries, f)
+    os.replace(tmp_path, ATLAS_MANIFEST)
+
+
+_atlases: dict[str, SpriteAtlas | None] = {}
+_atlas_lock = threading.Lock()
+
+
+def get_atlas(icon_variant: str = "white", height: int = 80) -> SpriteAtlas | None:
+    name = atlas_name(icon_variant, height)
+    with _atlas_lock:
+        if name in _atlases:
+            return _atlases[name]
+
+        entry = read_manifest().get(name)
+        if entry is None or not os.path.exists(os.path.join(ATLAS_ROOT, entry["file"])):
+            # not prebuilt, pack it once per process
+            try:
+                entry = write_atlas(icon_variant, height, load_all_icons(icon_variant, height))
+            except OSError:
+                logger.exception("could not write sprite atlas %s", name)
+                entry = None
+
+        _atlases[name] = _to_atlas(entry) if entry else None
+        return _atlases[name]
+
+
+def sprite_style(atlas: SpriteAtlas, icon_path: str, fluid: bool = False) -> str:
+    x, y, w, h = atlas.index[icon_path]
+    if not fluid:
+        return (f"width:{w}px;height:{h}px;background-image:url('{atlas.url}');"
+                f"background-position:-{x}px -{y}px;")
+
+    # percentage based so the sprite scales down with its column like st.image does
+    size_x = atlas.width / w * 100
+    size_y = atlas.height / h * 100
+    pos_x = x / (atlas.width - w) * 100 if atlas.width != w else 0
+    pos_y = y / (atlas.height - h) * 100 if atlas.height != h else 0
+    return (f"width:100%;max-width:{w}px;aspect-ratio:{w}/{h};background-image:url('{atlas.url}');"
+            f"background-size:{size_x:.3f}% {size_y:.3f}%;background-position:{pos_x:.3f}% {pos_y:.3f}%;")
+
+
+def sprite_html(atlas: SpriteAtlas, tooth_number: int, status, *, fluid: bool = False, extra_style: str = "",
+                css_class: str = "tooth-sprite") -> str:
+    icon_path = resolve_icon_path(tooth_number, status)
+    style = sprite_style(atlas, icon_path, fluid) + extra_style
+    return (f'<div class="{css_class}" role="img" style="{style}" '
+            f'title="Tooth {tooth_number}" aria-label="Tooth {tooth_number}"></div>')
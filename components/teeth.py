@@ -1,10 +1,20 @@
 import os.path
 import math
+from functools import lru_cache
 import streamlit as st
 from PIL import Image
+from reportlab.lib.utils import ImageReader
 import base64
 from io import BytesIO
 
+from components.icon_assets import ICON_VARIANT_DIRS, load_icon, load_manifest, static_icon_url
+from components.icon_encoding import encode_image, to_data_url
+from components.settings import DATA_URL_ICON_ENCODING, TOOTH_CHART_RENDERER, TOOTH_ICON_SOURCE
+from components.sprite_atlas import get_atlas, sprite_html
+from components.teeth_composite import compose_teeth_cached
+from components.tooth_cache import tooth_image_cache
+from components.tooth_status import resolve_icon_path
+
 def pil_image_to_base64(pil_image):
     buffered = BytesIO()
     pil_image.save(buffered, format="PNG")
@@ -32,130 +42,183 @@ teeth = {
 }
 
 
-def get_tooth_image(tooth_number, status, height=80, icon_variant="white", as_base64=False):
-    #remove this if you we add children tooth icons
-    if tooth_number>50:
-        if status is not None and status != "normal":       
-            if tooth_number%10<4:
-                tooth_number-=40
-            else:
-                tooth_number-=38
-    #----------------------------------------------
-
-    if icon_variant == "black":
-        path_prefix = "icons"
-    elif icon_variant == "white":
-        path_prefix = "icons_white_scaled"
-    else:
+def resolve_tooth_icon_path(tooth_number, status, icon_variant="white"):
+    path_prefix = ICON_VARIANT_DIRS.get(icon_variant)
+    if path_prefix is None:
         raise ValueError("icon variant should be black or white")
+    return os.path.join(path_prefix, resolve_icon_path(tooth_number, status))
+
+
+def get_tooth_image(tooth_number, status, height=80, icon_variant="white", as_base64=False):
+    full_path = resolve_tooth_icon_path(tooth_number, status, icon_variant)
+    if as_base64:
+        key = (tooth_number, full_path, height, icon_variant, "data_url")
+        return tooth_image_cache.get_or_create(
+            key, lambda: _encode_data_url(tooth_number, status, height, icon_variant))
+
+    # the returned image is shared through the cache, don't modify it in place
+    key = (tooth_number, full_path, height, icon_variant, "pil")
+    return tooth_image_cache.get_or_create(
+        key, lambda: load_icon(full_path, icon_variant, height, resolve_icon_path(tooth_number, status)))
+
+
+def get_tooth_image_bytes(tooth_number, status, height=80, icon_variant="white", encoding="png"):
+    # encoded once per icon and encoding, cached next to the decoded image
+    full_path = resolve_tooth_icon_path(tooth_number, status, icon_variant)
+    key = (tooth_number, full_path, height, icon_variant, f"bytes:{encoding}")
+    return tooth_image_cache.get_or_create(
+        key, lambda: encode_image(get_tooth_image(tooth_number, status, height, icon_variant), encoding))
+
+
+def get_tooth_image_reader(tooth_number, status, height=80, icon_variant="white") -> ImageReader:
+    # for the PDFs: reportlab reads the pixels straight from the cached image, no PNG round trip
+    full_path = resolve_tooth_icon_path(tooth_number, status, icon_variant)
+    key = (tooth_number, full_path, height, icon_variant, "reader")
+    return tooth_image_cache.get_or_create(
+        key, lambda: _image_reader(get_tooth_image(tooth_number, status, height, icon_variant)))
+
+
+def _image_reader(img) -> ImageReader:
+    reader = ImageReader(img)
+    # extract the RGB plane now, reportlab extracts the alpha mask itself on the first draw
+    reader.getRGBData()
+    return reader
+
+
+def _encode_data_url(tooth_number, status, height, icon_variant):
+    img = get_tooth_image(tooth_number, status, height, icon_variant)
+    data = get_tooth_image_bytes(tooth_number, status, height, icon_variant, DATA_URL_ICON_ENCODING)
+    return to_data_url(data, DATA_URL_ICON_ENCODING), img.size
+
+
+def warm_tooth_image_cache(tooth_numbers, statuses, heights=(80,), icon_variants=("white",),
+                           as_base64=(False,)) -> int:
+    # Fill the cache ahead of time so the first render doesn't touch the filesystem
+    count = 0
+    for tooth_number in tooth_numbers:
+        for status in statuses:
+            for height in heights:
+                for icon_variant in icon_variants:
+                    for encoded in as_base64:
+                        get_tooth_image(tooth_number, status, height=height, icon_variant=icon_variant,
+                                        as_base64=encoded)
+                        count += 1
+    return count
+
+
+CORRECTED_OUTLINE_STYLE = "outline:2px solid red;outline-offset:-2px;border-radius: 5px;"
 
-    # Determine correct icon path
-    if status is None or status == "normal":
-        icon_path = f"Icon_normal_teeth/{tooth_number}.png"
-    elif status == "missing":
-        icon_path = f"Icon_missing_teeth/{tooth_number}.png"
-    elif "impacted" in status:
-        icon_path = f"Icon_impacted/{tooth_number}.png"
-    elif status == "missing,implant":
-        icon_path = f"Icon_implant/{tooth_number}.png"
-    elif "df" in status and "rcf" in status:
-        icon_path = f"Icon_df_rcf/{tooth_number}.png"
-    elif "df" in status:
-        icon_path = f"Icon_df/{tooth_number}.png"
-    elif "rcf" in status and "crown" in status:
-        icon_path = f"Icon_crown_rcf/{tooth_number}.png"
-    elif "implant" in status and "crown" in status:
-        icon_path = f"Icon_crown_implant/{tooth_number}.png"
-    elif "crown" in status:
-        icon_path = f"Icon_crown/{tooth_number}.png"
-    elif "rcf" in status and "bridge" in status:
-        icon_path = f"Icon_bridge_tooth_rcf/{tooth_number}.png"
-    elif "bridge" in status and "implant" in status:
-        icon_path = f"Icon_bridge_implant/{tooth_number}.png"
-    elif status == "missing,bridge":
-        icon_path = f"Icon_bridge_pontic/{tooth_number}.png"
-    elif "bridge" in status and "normal" in status:
-        icon_path = f"Icon_bridge_tooth/{tooth_number}.png"
+
+def static_serving_enabled():
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def get_chart_atlas(icon_variant="white", height=80):
+    # Sprite atlases are served from ./static, only use them when Streamlit serves that folder
+    if TOOTH_CHART_RENDERER != "atlas" or not static_serving_enabled():
+        return None
+    return get_atlas(icon_variant, height)
+
+
+def get_tooth_image_url(tooth_number, status, height=80, icon_variant="white"):
+    # (url, (w, h)) of the pre-scaled icon served from ./static, None when icons are inlined
+    if TOOTH_ICON_SOURCE != "static" or not static_serving_enabled():
+        return None
+    return static_icon_url(icon_variant, height, resolve_icon_path(tooth_number, status))
+
+
+def tooth_icon_source():
+    # what get_tooth_image_src points at: the version of the static icons, None when it sends data URLs
+    if TOOTH_ICON_SOURCE != "static" or not static_serving_enabled():
+        return None
+    manifest = load_manifest()
+    return manifest["version"] if manifest is not None else None
+
+
+def get_tooth_image_src(tooth_number, status, height=80, icon_variant="white"):
+    # img src for markdown: a cacheable static URL if possible, a data URL otherwise
+    url = get_tooth_image_url(tooth_number, status, height, icon_variant)
+    if url is not None:
+        return url
+    return get_tooth_image(tooth_number, status, height, icon_variant, as_base64=True)
+
+
+def render_tooth_cell(tooth_num, status, outlined=False, atlas=None):
+    if atlas is not None:
+        st.markdown(
+            sprite_html(atlas, tooth_num, status, fluid=True,
+                        extra_style=CORRECTED_OUTLINE_STYLE if outlined else ""),
+            unsafe_allow_html=True,
+        )
+        return
+
+    url = get_tooth_image_url(tooth_num, status)
+    if outlined:
+        src, _ = url or get_tooth_image(tooth_num, status, as_base64=True)
+        st.markdown(
+            f"""
+            <img src="{src}"
+                 style="
+                     outline:2px solid red;
+                     outline-offset:-2px;
+                     border-radius: 5px;
+                     height:auto; width:auto;
+                 ">
+            """,
+            unsafe_allow_html=True,
+        )
+    elif url is not None:
+        st.markdown(f'<img src="{url[0]}" style="max-width:100%; height:auto;" alt="Tooth {tooth_num}">',
+                    unsafe_allow_html=True)
     else:
-        icon_path = f"Icon_normal_teeth/{tooth_number}.png"
-        print(f"tooth number: {tooth_number} has an unrecognized status")
+        st.image(get_tooth_image(tooth_num, status))
 
-    full_path = os.path.join(path_prefix, icon_path)
-    img = Image.open(full_path)
 
-    # Resize the image
-    w, h = img.size
-    new_w = int(w * (height / h))
-    img_resized = img.resize((new_w, height))
-    resized_width, resized_height = img_resized.size
-    if as_base64:
-        # Convert to base64 string
-        buffer = BytesIO()
-        img_resized.save(buffer, format="PNG")
-        img_str = base64.b64encode(buffer.getvalue()).decode()
-        return f"data:image/png;base64,{img_str}", (resized_width, resized_height)
+def render_tooth_thumbnail(tooth_num, status, width=40):
+    url = get_tooth_image_url(tooth_num, status)
+    if url is not None:
+        st.markdown(f'<img src="{url[0]}" width="{width}" alt="Tooth {tooth_num}">', unsafe_allow_html=True)
     else:
-        # Return PIL image for st.image
-        return img_resized
+        st.image(get_tooth_image(tooth_num, status), width=width)
 
 
 def load_teeth(teeth,child, outline_corrected_images: bool = False):
     if child:
         top_row = list(reversed(range(51, 56))) + list(range(61, 66))
         bottom_row = list(reversed(range(81, 86))) + list(range(71, 76))
-        cols = st.columns(10)
-        cols2 = st.columns(10)
     else:
         top_row = list(reversed(range(11, 19))) + list(range(21, 29))
         bottom_row = list(reversed(range(41, 49))) + list(range(31, 39))
-        cols = st.columns(16)
-        cols2 = st.columns(16)
 
     corrected_teeth = st.session_state.get("corrected_teeth", set())
 
+    if TOOTH_CHART_RENDERER == "composite":
+        # one image for the whole chart, its slots line up with the tooth button columns
+        outlined = corrected_teeth if outline_corrected_images else ()
+        chart = compose_teeth_cached(teeth, [top_row, bottom_row], get_tooth_image, outlined)
+        st.image(chart, use_container_width=True)
+        return
+
+    cols = st.columns(len(top_row))
+    cols2 = st.columns(len(bottom_row))
+    atlas = get_chart_atlas()
 
     for i, tooth_num in enumerate(top_row):
         with cols[i]:
-            img = get_tooth_image(tooth_num, teeth[tooth_num])
-            if outline_corrected_images and tooth_num in corrected_teeth:
-                data_url = pil_to_data_url(img)
-                st.markdown(
-                    f"""
-                    <img src="{data_url}"
-                         style="
-                             outline:2px solid red;
-                             outline-offset:-2px;
-                             border-radius: 5px;
-                             height:auto; width:auto;
-                         ">
-                    """,
-                    unsafe_allow_html=True,
-                )
-            else:
-                st.image(img)
-
+            outlined = outline_corrected_images and tooth_num in corrected_teeth
+            render_tooth_cell(tooth_num, teeth[tooth_num], outlined, atlas)
 
     for i, tooth_num in enumerate(bottom_row):
         with cols2[i]:
-            img = get_tooth_image(tooth_num, teeth[tooth_num])
-            if outline_corrected_images and tooth_num in corrected_teeth:
-                data_url = pil_to_data_url(img)
-                st.markdown(
-                    f"""
-                    <img src="{data_url}"
-                         style="
-                             outline:2px solid red;
-                             outline-offset:-2px;
-                             border-radius: 5px;
-                             height:auto; width:auto;
-                         ">
-                    """,
-                    unsafe_allow_html=True,
-                )
-            else:
-                st.image(img)
+            outlined = outline_corrected_images and tooth_num in corrected_teeth
+            render_tooth_cell(tooth_num, teeth[tooth_num], outlined, atlas)
 
-def load_teeth_circle(teeth, child):
+CIRCLE_CONTAINER_SIZE = 600
+
+
+@lru_cache(maxsize=8)
+def circle_layout(child, container_size=CIRCLE_CONTAINER_SIZE):
+    # (tooth, x, y, rotation) for every tooth, only depends on the layout parameters
     if child:
         top_row = list(reversed(range(51, 56))) + list(range(61, 66))
         bottom_row = list(reversed(range(71, 76))) + list(range(81, 86))
@@ -166,10 +229,46 @@ def load_teeth_circle(teeth, child):
     all_teeth =bottom_row+top_row
 
     num_items = len(all_teeth)
-    container_size = 600
     radius = (container_size-100) / 3
     center = container_size / 2
 
+    positions = []
+    for i, tooth_num in enumerate(all_teeth):
+        angle_deg = (i * (360 / num_items))+(360 / num_items)/2
+        if child:
+            row=10
+        else:
+            row=16
+        if i < row:
+            rotation=angle_deg + 90
+        else:
+            rotation=angle_deg-90
+        angle_rad = math.radians(angle_deg)
+        x = center + radius * math.cos(angle_rad)
+        y = center-50 + 1.7*(radius * math.sin(angle_rad))
+        if y>center-50:
+            y+=50
+        positions.append((tooth_num, x, y, rotation))
+    return tuple(positions)
+
+
+@lru_cache(maxsize=512)
+def circle_fragment(tooth_num, status, x, y, rotation, atlas=None, icon_source=None):
+    # icon_source (see tooth_icon_source) is only part of the key, fragments switch to static URLs once icons are prebuilt
+    if atlas is not None:
+        return sprite_html(atlas, tooth_num, status, css_class="item",
+                           extra_style=f"left: {x}px; top: {y}px; transform: rotate({rotation}deg);")
+    img_src, (width, height)= get_tooth_image_src(tooth_num, status)
+    return (
+        f'<img class="item" src="{img_src}" '
+        f'style="left: {x}px; top: {y}px; transform: rotate({rotation}deg);" '
+        f'title="Tooth {tooth_num}" alt="Tooth {tooth_num}">'
+    )
+
+
+@lru_cache(maxsize=64)
+def circle_html(statuses, child, container_size=CIRCLE_CONTAINER_SIZE, atlas=None, icon_source=None):
+    # keyed by the statuses in layout order, a one-tooth edit only rebuilds that tooth's fragment
     html = f"""
     <style>
     .circle-container {{
@@ -186,28 +285,19 @@ def load_teeth_circle(teeth, child):
     </style>
     <div class="circle-container">
     """
-
-    for i, tooth_num in enumerate(all_teeth):
-        img_src, (width, height)= get_tooth_image(tooth_num, teeth[tooth_num], as_base64=True)
-        angle_deg = (i * (360 / num_items))+(360 / num_items)/2
-        if child:
-            row=10
-        else:
-            row=16
-        if i < row:
-            rotation=angle_deg + 90
-        else:
-            rotation=angle_deg-90
-        angle_rad = math.radians(angle_deg)
-        x = center + radius * math.cos(angle_rad)
-        y = center-50 + 1.7*(radius * math.sin(angle_rad))
-        if y>center-50:
-            y+=50
-        html += (
-            f'<img class="item" src="{img_src}" '
-            f'style="left: {x}px; top: {y}px; transform: rotate({rotation}deg);" '
-            f'title="Tooth {tooth_num}" alt="Tooth {tooth_num}">'
-        )
+    layout = circle_layout(child, container_size)
+    html += "".join(
+        circle_fragment(tooth_num, status, x, y, rotation, atlas, icon_source)
+        for (tooth_num, x, y, rotation), status in zip(layout, statuses)
+    )
     html += "</div>"
+    return html
 
+
+def load_teeth_circle(teeth, child):
+    layout = circle_layout(child)
+    statuses = tuple(teeth[tooth_num] for tooth_num, *_ in layout)
+    atlas = get_chart_atlas()
+    icon_source = tooth_icon_source() if atlas is None else None
+    html = circle_html(statuses, bool(child), CIRCLE_CONTAINER_SIZE, atlas, icon_source)
     st.markdown(html, unsafe_allow_html=True)
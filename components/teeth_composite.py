@@ -0,0 +1,69 @@
+import numpy as np
+from PIL import Image
+
+from components.tooth_cache import tooth_image_cache
+
+OUTLINE_COLOR = (255, 0, 0)
+OUTLINE_WIDTH = 2
+ROW_GAP = 8
+
+
+def alpha_blend(canvas: np.ndarray, src: np.ndarray, x: int, y: int):
+    # Porter-Duff "over" of an RGBA float image onto the RGBA float canvas, in place
+    h, w = src.shape[:2]
+    dst = canvas[y:y + h, x:x + w]
+    src_a = src[..., 3:4]
+    dst_a = dst[..., 3:4]
+    out_a = src_a + dst_a * (1.0 - src_a)
+    out_rgb = src[..., :3] * src_a + dst[..., :3] * dst_a * (1.0 - src_a)
+    np.divide(out_rgb, out_a, out=out_rgb, where=out_a > 0)
+    dst[..., :3] = out_rgb
+    dst[..., 3:4] = out_a
+
+
+def draw_outline(canvas: np.ndarray, box, color=OUTLINE_COLOR, width: int = OUTLINE_WIDTH):
+    # same look as the css outline (2px, drawn inside the tooth image)
+    x0, y0, x1, y1 = box
+    rgba = np.array([c / 255.0 for c in color] + [1.0], dtype=np.float32)
+    canvas[y0:y0 + width, x0:x1] = rgba
+    canvas[y1 - width:y1, x0:x1] = rgba
+    canvas[y0:y1, x0:x0 + width] = rgba
+    canvas[y0:y1, x1 - width:x1] = rgba
+
+
+def compose_teeth(teeth, rows: list[list[int]], get_image, corrected_teeth=(), row_gap: int = ROW_GAP):
+    """Composite whole tooth rows into one RGBA image.
+
+    Every tooth gets an equally wide slot (the widest icon), so the slots line
+    up with ``st.columns`` of the same count, e.g. the tooth button rows.
+    """
+    icons = {n: get_image(n, teeth[n]) for row in rows for n in row}
+    slot_w = max(img.width for img in icons.values())
+    row_h = max(img.height for img in icons.values())
+    width = slot_w * max(len(row) for row in rows)
+    height = row_h * len(rows) + row_gap * (len(rows) - 1)
+
+    canvas = np.zeros((height, width, 4), dtype=np.float32)
+    for r, row in enumerate(rows):
+        y = r * (row_h + row_gap)
+        for i, tooth in enumerate(row):
+            img = icons[tooth]
+            src = np.asarray(img.convert("RGBA"), dtype=np.float32) / 255.0
+            x = i * slot_w + (slot_w - img.width) // 2
+            top = y + (row_h - img.height)
+            alpha_blend(canvas, src, x, top)
+            if tooth in corrected_teeth:
+                draw_outline(canvas, (x, top, x + img.width, top + img.height))
+
+    pixels = np.clip(canvas * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    return Image.fromarray(pixels, "RGBA")
+
+
+def compose_teeth_cached(teeth, rows: list[list[int]], get_image, corrected_teeth=(), *, height: int = 80,
+                         icon_variant: str = "white"):
+    # get_image(tooth, status, height, icon_variant), the composite depends on all of them
+    statuses = tuple(teeth[n] for row in rows for n in row)
+    outlined = tuple(sorted(n for row in rows for n in row if n in corrected_teeth))
+    key = ("composite", get_image, height, icon_variant, tuple(map(tuple, rows)), statuses, outlined)
+    return tooth_image_cache.get_or_create(key, lambda: compose_teeth(
+        teeth, rows, lambda n, status: get_image(n, status, height, icon_variant), corrected_teeth))
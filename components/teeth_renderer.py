@@ -1,44 +1,36 @@
 import os
 import streamlit as st
 from components.teeth import load_teeth, load_teeth_circle
-from input.teethSet import teeth as teethInput, childteeth as childteethInput
-from AIOutput.teethSet import teeth as teethAI, childteeth as childteethAI
-import copy
-@st.cache_data()
-def get_teeth_data(teeth) -> dict[int, str | None]:
-    teeth_dict = copy.deepcopy(teeth)
-    return teeth_dict
+from components.dentition import Dentition
+from components.difference_tracker import mark_corrected, notify_tooth_changed
+from components.teeth_templates import AI_TEMPLATE, MANUAL_TEMPLATE, new_dentition
+from components.tooth_status import NO_STATUS, ToothFlag
+from components.tooth_transitions import DIALOG_STATES, TRANSITIONS, CheckboxState
+def get_teeth_data(template: Dentition) -> Dentition:
+    # a private, writable copy of the frozen template for this session
+    return new_dentition(template)
 
 def show_tooth_modal(tooth_number):
     st.session_state.selected_tooth = tooth_number
     st.session_state.show_tooth_config_dialog = True
-def check_checkbox_status(checkbox_name: str, tooth_number: int, teeth: dict[int, str | None]) -> bool:
-    return True if checkbox_name in str(teeth[tooth_number]) else False
-
-def check_checkbox_disabled(false_when_enabled: list[str], tooth_number: int, teeth: dict[int, str | None]) -> bool:
-    return len([x for x in false_when_enabled if x in str(teeth[tooth_number])]) > 0
-
-def toggle_tooth_presence(presence: str, tooth_number: int, teeth: dict[int, str | None]):
-    if teeth[tooth_number] == presence or teeth[tooth_number] is None:
-        if presence == "missing":
-            if "missing" in str(teeth[tooth_number]):
-                teeth[tooth_number] = None
-            else:
-                teeth[tooth_number] = "missing"
-        if presence == "normal":
-            if "normal" in str(teeth[tooth_number]):
-                teeth[tooth_number] = None
-            else:
-                teeth[tooth_number] = "normal"
-
-    elif presence in str(teeth[tooth_number]):
-        if presence == "missing" or presence == "normal":
-            teeth[tooth_number] = None
+def check_checkbox_status(flag: ToothFlag, tooth_number: int, teeth: Dentition) -> bool:
+    return flag in teeth[tooth_number]
 
-        else:
-            teeth[tooth_number] = str(teeth[tooth_number]).replace(f",{presence}", "")
-    else:
-        teeth[tooth_number] = str(teeth[tooth_number]) + f",{presence}"
+def check_checkbox_disabled(false_when_enabled: ToothFlag, tooth_number: int, teeth: Dentition) -> bool:
+    return bool(teeth[tooth_number] & false_when_enabled)
+
+def toggle_tooth_presence(presence: ToothFlag, tooth_number: int, teeth: Dentition):
+    teeth[tooth_number] = TRANSITIONS[teeth[tooth_number], presence]
+
+def toggle_and_track(presence: ToothFlag, tooth_number: int, teeth: Dentition):
+    toggle_tooth_presence(presence, tooth_number, teeth)
+    notify_tooth_changed(teeth, tooth_number)
+
+def option_checkbox(option: CheckboxState, tooth_number: int, teeth: Dentition, key: str | None = None) -> bool:
+    if option.disabled:
+        return st.checkbox(option.label, key=key, disabled=True, value=option.checked)
+    return st.checkbox(option.label, key=key, on_change=toggle_and_track, args=(option.flag, tooth_number, teeth),
+                       value=option.checked)
 
 def render_button_row(columns, numbers, teeth, disable_buttons, differences=None,
                       color_differences_instead_of_manual=False):
@@ -48,7 +40,7 @@ def render_button_row(columns, numbers, teeth, disable_buttons, differences=None
         with column:
             button_key = f"btn_{n}_b"
             button_color = None
-            if teeth[n] is not None and not color_differences_instead_of_manual:
+            if teeth[n] and not color_differences_instead_of_manual:
                 button_color = "background-color: rgb(255, 51, 0)"
             if n in differences.keys() and color_differences_instead_of_manual:
                 button_color = "background-color: rgb(255, 51, 0)"
@@ -71,87 +63,36 @@ def render_button_row(columns, numbers, teeth, disable_buttons, differences=None
                 else:
                     show_tooth_modal(n)
 @st.dialog(" ", width="large")
-def show_options(teeth: dict[int, str | None], add_to_corrected_set: bool = False):
+def show_options(teeth: Dentition, add_to_corrected_set: bool = False):
     tooth_number = st.session_state.selected_tooth
-    missing_properties = ["Implant", "Implant bridge", "Implant crown", "Bridge"]
-    present_properties = ["Dental filling", "Impacted", "Crown", "Bridge", "Root canal filling"]
+    # what every checkbox shows is precomputed per status, see components/tooth_transitions.py
+    state = DIALOG_STATES[teeth[tooth_number]]
 
     st.title(f"Tooth {tooth_number}")
     col1, col2 = st.columns(2)
 
     with col1:
-        if "missing" in str(teeth[tooth_number]):
-            present_checkbox = st.checkbox("Present", key=f"present_{tooth_number}", disabled=True)
-        else:
-            present_checkbox = st.checkbox("Present", key=f"present_{tooth_number}", on_change=toggle_tooth_presence,
-                                           args=("normal", tooth_number, teeth),
-                                           value=check_checkbox_status("normal", tooth_number, teeth))
+        option_checkbox(state.present, tooth_number, teeth, key=f"present_{tooth_number}")
 
     with col2:
-        if "normal" in str(teeth[tooth_number]):
-            missing_checkbox = st.checkbox("Missing", key=f"missing_{tooth_number}", disabled=True)
-        else:
-            missing_checkbox = st.checkbox("Missing", key=f"missing_{tooth_number}", on_change=toggle_tooth_presence,
-                                           args=("missing", tooth_number, teeth),
-                                           value=check_checkbox_status("missing", tooth_number,teeth))
+        option_checkbox(state.missing, tooth_number, teeth, key=f"missing_{tooth_number}")
 
     with col1:
-        if present_checkbox:
-            impacted_checkbox = st.checkbox("Impacted",
-                                            disabled=check_checkbox_disabled(["bridge", "crown", "rcf", "df"],
-                                                                             tooth_number,teeth),
-                                            on_change=toggle_tooth_presence, args=("impacted", tooth_number, teeth),
-                                            value=check_checkbox_status("impacted", tooth_number,  teeth))
-            dental_filling_checkbox = st.checkbox("Dental filling", disabled=check_checkbox_disabled(
-                ["crown", "bridge", "rcf", "impacted"], tooth_number, teeth), on_change=toggle_tooth_presence,
-                                                  args=("df", tooth_number, teeth),
-                                                  value=check_checkbox_status("df", tooth_number, teeth))
-            bridge_checkbox = st.checkbox("Bridge", disabled=check_checkbox_disabled(["df", "crown", "rcf", "impacted"],
-                                                                                     tooth_number, teeth),
-                                          on_change=toggle_tooth_presence, args=("bridge", tooth_number, teeth),
-                                          value=check_checkbox_status("bridge", tooth_number, teeth))
-            crown_checkbox = st.checkbox("Crown", disabled=check_checkbox_disabled(["df", "bridge", "rcf", "impacted"],
-                                                                                   tooth_number, teeth),
-                                         on_change=toggle_tooth_presence, args=("crown", tooth_number, teeth),
-                                         value=check_checkbox_status("crown", tooth_number, teeth))
-            root_canal_filling_checkbox = st.checkbox("Root canal filling",
-                                                      disabled=not check_checkbox_disabled(["crown", "bridge", "df"],
-                                                                                           tooth_number, teeth),
-                                                      on_change=toggle_tooth_presence, args=("rcf", tooth_number, teeth),
-                                                      value=check_checkbox_status("rcf", tooth_number, teeth))
-
-        if missing_checkbox:
-            implant_checkbox = st.checkbox("Implant", disabled=check_checkbox_disabled(["crown"], tooth_number,teeth),
-                                           on_change=toggle_tooth_presence, args=("implant", tooth_number, teeth),
-                                           value=check_checkbox_status("implant", tooth_number,teeth))
-            if not "crown" in str(teeth[tooth_number]):
-                bridge_checkbox = st.checkbox("Bridge", on_change=toggle_tooth_presence, args=("bridge", tooth_number, teeth),
-                                              value=check_checkbox_status("bridge", tooth_number,teeth))
-            elif "implant" not in str(teeth[tooth_number]):
-                bridge_checkbox = st.checkbox("Bridge", disabled=True,
-                                              value=check_checkbox_status("bridge,pontic", tooth_number,teeth),)
-            else:
-                bridge_checkbox = st.checkbox("Bridge", disabled=True,
-                                              value=check_checkbox_status("bridge", tooth_number,teeth))
-            if implant_checkbox and not "bridge" in str(teeth[tooth_number]):
-                crown_checkbox = st.checkbox("Crown", on_change=toggle_tooth_presence, args=("crown", tooth_number, teeth),
-                                             value=check_checkbox_status("crown", tooth_number, teeth))
-            else:
-                crown_checkbox = st.checkbox("Crown", disabled=True, value=check_checkbox_status("crown", tooth_number, teeth))
+        for option in state.options:
+            option_checkbox(option, tooth_number, teeth)
 
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Clear all"):
-                teeth[tooth_number] = None
+                teeth[tooth_number] = NO_STATUS
+                notify_tooth_changed(teeth, tooth_number)
                 st.rerun()
 
         with col2:
             if st.button("Submit"):
                 st.session_state.show_tooth_config_dialog = False
                 if add_to_corrected_set:
-                    if not st.session_state.get("corrected_teeth", False):
-                        st.session_state.corrected_teeth = set()
-                    st.session_state.corrected_teeth.add(tooth_number)
+                    mark_corrected(tooth_number)
                 st.rerun()
 
 
@@ -160,19 +101,19 @@ def render_teeth(page: str, disable_buttons: bool = False,circle=False,child=Fal
         raise Exception("page can't be empty")
 
 
-    if not st.session_state.get(f"childteeth_dict_{page}"):
+    if not st.session_state.get(f"dentition_{page}"):
         if page=="ai":
-                teeth = get_teeth_data(childteethAI)
+            st.session_state[f"dentition_{page}"] = get_teeth_data(AI_TEMPLATE)
         else:
-                teeth = get_teeth_data(childteethInput)
-        st.session_state[f"childteeth_dict_{page}"] = teeth
+            st.session_state[f"dentition_{page}"] = get_teeth_data(MANUAL_TEMPLATE)
+    dentition = st.session_state[f"dentition_{page}"]
+
+    # adult and child teeth are views on the same array
+    if not st.session_state.get(f"childteeth_dict_{page}"):
+        st.session_state[f"childteeth_dict_{page}"] = dentition.child
 
     if not st.session_state.get(f"teeth_dict_{page}"):
-        if page=="ai":
-            teeth = get_teeth_data(teethAI)
-        else:
-            teeth = get_teeth_data(teethInput)
-        st.session_state[f"teeth_dict_{page}"] = teeth
+        st.session_state[f"teeth_dict_{page}"] = dentition.adult
 
     if child:
         teeth = st.session_state[f"childteeth_dict_{page}"]
@@ -0,0 +1,13 @@
+from components.dentition import Dentition
+from input import teethSet as input_teeth
+from AIOutput import teethSet as ai_teeth
+
+# Read-only starting points for the teeth of a session, built once per process.
+# Sessions take a copy (52 bytes) and never write to the templates or the teethSet dicts.
+MANUAL_TEMPLATE = Dentition({**input_teeth.teeth, **input_teeth.childteeth}).freeze()
+MISSING_TEMPLATE = Dentition({**input_teeth.missingteeth, **input_teeth.missingchildteeth}).freeze()
+AI_TEMPLATE = Dentition({**ai_teeth.teeth, **ai_teeth.childteeth}).freeze()
+
+
+def new_dentition(template: Dentition) -> Dentition:
+    return template.copy()
@@ -0,0 +1,104 @@
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+from reportlab.lib.utils import ImageReader
+
+# default budget for the in-process tooth image cache (decoded pixels + encoded strings)
+DEFAULT_MAX_BYTES = 96 * 1024 * 1024
+
+
+def estimate_size(value) -> int:
+    if isinstance(value, Image.Image):
+        w, h = value.size
+        return w * h * len(value.getbands())
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, ImageReader):
+        # the extracted RGB plane plus the alpha plane
+        w, h = value.getSize()
+        return w * h * 4
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_size(v) for v in value)
+    return 64
+
+
+class ToothImageCache:
+    """Bounded, thread-safe LRU cache for rendered tooth icons.
+
+    Entries are evicted least-recently-used first once the estimated size of
+    all cached values exceeds ``max_bytes``. Cached PIL images are shared
+    between callers and must not be mutated.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        value = self.get(key)
+        if value is None:
+            # build outside the lock so slow decodes don't serialize other lookups
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+tooth_image_cache = ToothImageCache()
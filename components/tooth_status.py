@@ -0,0 +1,149 @@
+import logging
+from enum import IntFlag
+from functools import lru_cache
+from itertools import combinations
+
+logger = logging.getLogger(__name__)
+
+
+class ToothFlag(IntFlag):
+    """Tooth status as bit flags, no flags set (0) is the ``None`` status."""
+    NORMAL = 1
+    MISSING = 2
+    IMPACTED = 4
+    DF = 8
+    IMPLANT = 16
+    BRIDGE = 32
+    CROWN = 64
+    RCF = 128
+
+
+NO_STATUS = ToothFlag(0)
+PRESENCE_FLAGS = ToothFlag.NORMAL | ToothFlag.MISSING
+
+# every flag that can appear in a comma-joined tooth status, in canonical order
+STATUS_FLAGS = tuple(flag.name.lower() for flag in ToothFlag)
+FLAG_BY_NAME = {flag.name.lower(): flag for flag in ToothFlag}
+
+
+@lru_cache(maxsize=1024)
+def _parse_status_string(status: str) -> ToothFlag:
+    flags = NO_STATUS
+    for part in status.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        flag = FLAG_BY_NAME.get(part)
+        if flag is None:
+            logger.warning("ignoring unknown tooth status flag %r in %r", part, status)
+            continue
+        flags |= flag
+    return flags
+
+
+def parse_status(status) -> ToothFlag:
+    # "normal,df,rcf" -> NORMAL|DF|RCF, None -> 0, flags pass through
+    if status is None:
+        return NO_STATUS
+    if isinstance(status, int):
+        return ToothFlag(status)
+    return _parse_status_string(status)
+
+
+@lru_cache(maxsize=256)
+def format_status(flags) -> str | None:
+    # inverse of parse_status, flags are written in canonical order
+    flags = parse_status(flags)
+    if not flags:
+        return None
+    return ",".join(flag.name.lower() for flag in ToothFlag if flag in flags)
+
+
+def status_tags(status) -> list[str]:
+    flags = parse_status(status)
+    return [flag.name.lower() for flag in ToothFlag if flag in flags]
+
+
+def parse_teeth(teeth: dict) -> dict[int, ToothFlag]:
+    return {tooth: parse_status(status) for tooth, status in teeth.items()}
+
+
+def format_teeth(teeth: dict) -> dict[int, str | None]:
+    # back to the input/teethSet.py format
+    return {tooth: format_status(status) for tooth, status in teeth.items()}
+
+
+NORMAL_ICON_DIR = "Icon_normal_teeth"
+
+# Ordered icon rules, first match wins. "exact" rules only match that flag set,
+# "contains" rules match any flag set that includes the listed flags.
+ICON_RULES = [
+    ("exact", {"missing"}, "Icon_missing_teeth"),
+    ("contains", {"impacted"}, "Icon_impacted"),
+    ("exact", {"missing", "implant"}, "Icon_implant"),
+    ("contains", {"df", "rcf"}, "Icon_df_rcf"),
+    ("contains", {"df"}, "Icon_df"),
+    ("contains", {"rcf", "crown"}, "Icon_crown_rcf"),
+    ("contains", {"implant", "crown"}, "Icon_crown_implant"),
+    ("contains", {"crown"}, "Icon_crown"),
+    ("contains", {"rcf", "bridge"}, "Icon_bridge_tooth_rcf"),
+    ("contains", {"bridge", "implant"}, "Icon_bridge_implant"),
+    ("exact", {"missing", "bridge"}, "Icon_bridge_pontic"),
+    ("contains", {"bridge", "normal"}, "Icon_bridge_tooth"),
+]
+
+
+def _match_rules(flags: frozenset):
+    if not flags or flags == {"normal"}:
+        return NORMAL_ICON_DIR
+    for kind, required, icon_dir in ICON_RULES:
+        if kind == "exact" and flags == required:
+            return icon_dir
+        if kind == "contains" and required <= flags:
+            return icon_dir
+    return None
+
+
+def _compile_icon_table() -> dict[frozenset, str]:
+    table = {}
+    for size in range(len(STATUS_FLAGS) + 1):
+        for combo in combinations(STATUS_FLAGS, size):
+            flags = frozenset(combo)
+            icon_dir = _match_rules(flags)
+            if icon_dir is not None:
+                table[flags] = icon_dir
+    return table
+
+
+# flag set -> icon directory, for every combination that has an icon
+ICON_DIR_BY_FLAGS = _compile_icon_table()
+
+# child teeth without their own icons borrow the icon of an adult tooth
+CHILD_ICON_TOOTH = {
+    tooth: tooth - 40 if tooth % 10 < 4 else tooth - 38
+    for quadrant in (50, 60, 70, 80)
+    for tooth in range(quadrant + 1, quadrant + 6)
+}
+
+
+@lru_cache(maxsize=1024)
+def canonicalize_status(status) -> frozenset:
+    if status is None:
+        return frozenset()
+    if isinstance(status, int):
+        return frozenset(status_tags(status))
+    return frozenset(part.strip() for part in status.split(",") if part.strip())
+
+
+@lru_cache(maxsize=4096)
+def resolve_icon_path(tooth_number: int, status) -> str:
+    flags = canonicalize_status(status)
+    if flags and flags != {"normal"}:
+        #remove this if you we add children tooth icons
+        tooth_number = CHILD_ICON_TOOTH.get(tooth_number, tooth_number)
+
+    icon_dir = ICON_DIR_BY_FLAGS.get(flags)
+    if icon_dir is None:
+        icon_dir = NORMAL_ICON_DIR
+        logger.warning("tooth number: %s has an unrecognized status %r", tooth_number, status)
+    return f"{icon_dir}/{tooth_number}.png"
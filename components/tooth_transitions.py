@@ -0,0 +1,94 @@
+from collections import deque
+from typing import NamedTuple
+
+from components.tooth_status import NO_STATUS, PRESENCE_FLAGS, ToothFlag
+
+F = ToothFlag
+
+# Rules of the tooth configuration dialog (teeth_renderer.show_options).
+# Options of a present tooth: flag -> (label, flags that disable it while set, flags of which one must be set)
+PRESENT_OPTIONS = {
+    F.IMPACTED: ("Impacted", F.BRIDGE | F.CROWN | F.RCF | F.DF, NO_STATUS),
+    F.DF: ("Dental filling", F.CROWN | F.BRIDGE | F.RCF | F.IMPACTED, NO_STATUS),
+    F.BRIDGE: ("Bridge", F.DF | F.CROWN | F.RCF | F.IMPACTED, NO_STATUS),
+    F.CROWN: ("Crown", F.DF | F.BRIDGE | F.RCF | F.IMPACTED, NO_STATUS),
+    # a root canal filling sits under a filling, crown or bridge
+    F.RCF: ("Root canal filling", NO_STATUS, F.CROWN | F.BRIDGE | F.DF),
+}
+# Options of a missing tooth, same layout
+MISSING_OPTIONS = {
+    F.IMPLANT: ("Implant", F.CROWN, NO_STATUS),
+    F.BRIDGE: ("Bridge", F.CROWN, NO_STATUS),
+    # only an implant can carry a crown
+    F.CROWN: ("Crown", F.BRIDGE, F.IMPLANT),
+}
+
+
+class CheckboxState(NamedTuple):
+    label: str
+    flag: ToothFlag
+    checked: bool
+    disabled: bool
+
+
+class DialogState(NamedTuple):
+    present: CheckboxState
+    missing: CheckboxState
+    # the checkboxes below present/missing, in display order
+    options: tuple[CheckboxState, ...]
+
+
+def _option_state(status: ToothFlag, flag: ToothFlag, rule) -> CheckboxState:
+    label, excluded, required = rule
+    disabled = bool(status & excluded) or (bool(required) and not status & required)
+    return CheckboxState(label, flag, flag in status, disabled)
+
+
+def _dialog_state(status: ToothFlag) -> DialogState:
+    # present and missing exclude each other
+    present = CheckboxState("Present", F.NORMAL, F.NORMAL in status and F.MISSING not in status, F.MISSING in status)
+    missing = CheckboxState("Missing", F.MISSING, F.MISSING in status and F.NORMAL not in status, F.NORMAL in status)
+    options = []
+    if present.checked:
+        options += [_option_state(status, flag, rule) for flag, rule in PRESENT_OPTIONS.items()]
+    if missing.checked:
+        options += [_option_state(status, flag, rule) for flag, rule in MISSING_OPTIONS.items()]
+    return DialogState(present, missing, tuple(options))
+
+
+def _toggle(status: ToothFlag, flag: ToothFlag) -> ToothFlag:
+    if flag & PRESENCE_FLAGS:
+        # unchecking present/missing clears every other flag as well
+        return NO_STATUS if flag in status else status | flag
+    return status ^ flag
+
+
+ALL_STATUSES = [ToothFlag(mask) for mask in range(1 << len(ToothFlag))]
+
+# status -> what the dialog shows, for every flag combination
+DIALOG_STATES = {status: _dialog_state(status) for status in ALL_STATUSES}
+
+# (status, flag) -> status after clicking that flag's checkbox
+TRANSITIONS = {(status, flag): _toggle(status, flag) for status in ALL_STATUSES for flag in ToothFlag}
+
+
+def enabled_flags(status: ToothFlag) -> list[ToothFlag]:
+    state = DIALOG_STATES[status]
+    return [box.flag for box in (state.present, state.missing, *state.options) if not box.disabled]
+
+
+def _reachable_statuses() -> frozenset:
+    # every status the dialog can produce, starting from an untouched tooth
+    seen = {NO_STATUS}
+    queue = deque(seen)
+    while queue:
+        status = queue.popleft()
+        for flag in enabled_flags(status):
+            target = TRANSITIONS[status, flag]
+            if target not in seen:
+                seen.add(target)
+                queue.append(target)
+    return frozenset(seen)
+
+
+REACHABLE_STATUSES = _reachable_statuses()
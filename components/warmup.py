@@ -0,0 +1,99 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from components import pdf, pdf_profesionnal
+from components.log import configure_logging
+from components.settings import ICON_WARMUP
+from components.teeth import get_tooth_image, get_tooth_image_url
+from components.tooth_cache import tooth_image_cache
+from components.tooth_status import ICON_DIR_BY_FLAGS, NO_STATUS, ToothFlag, parse_status
+
+logger = logging.getLogger(__name__)
+
+ALL_TEETH = [q + n for q in (10, 20, 30, 40) for n in range(1, 9)] + \
+            [q + n for q in (50, 60, 70, 80) for n in range(1, 6)]
+UI_HEIGHTS = (80,)
+PDF_HEIGHTS = (
+    int(pdf.TOOTH_H_PT * pdf.RASTER_SCALE),
+    int(pdf_profesionnal.TOOTH_H_PT_LARGE * pdf.RASTER_SCALE),
+)
+
+
+def representative_statuses() -> list[ToothFlag]:
+    # one status per icon directory is enough, the cache is keyed on the resolved icon path
+    statuses = {}
+    for flags, icon_dir in ICON_DIR_BY_FLAGS.items():
+        status = parse_status(",".join(flags))
+        if icon_dir not in statuses or status == NO_STATUS:
+            statuses[icon_dir] = status
+    return list(statuses.values())
+
+
+def warmup_jobs() -> list[tuple]:
+    jobs = []
+    for tooth in ALL_TEETH:
+        for status in representative_statuses():
+            for height in UI_HEIGHTS + PDF_HEIGHTS:
+                jobs.append((tooth, status, height, False))
+            # data URLs are only sent when the icons can't be referenced from ./static
+            if get_tooth_image_url(tooth, status) is None:
+                jobs.append((tooth, status, UI_HEIGHTS[0], True))
+    return jobs
+
+
+def max_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # not available on windows
+        return None
+    # ru_maxrss is in KB on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def warm_icon_cache(max_workers: int | None = None) -> dict:
+    start = time.perf_counter()
+    jobs = warmup_jobs()
+    workers = max_workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="icon-warmup") as pool:
+        list(pool.map(lambda job: get_tooth_image(job[0], job[1], height=job[2], as_base64=job[3]), jobs))
+
+    report = {
+        "images": len(jobs),
+        "seconds": round(time.perf_counter() - start, 3),
+        "cache_mb": round(tooth_image_cache.stats()["bytes"] / 1e6, 1),
+        "max_rss_mb": max_rss_mb(),
+    }
+    logger.info("tooth icon warm-up: %s", report)
+    return report
+
+
+class IconWarmup:
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.report = None
+        self.thread = None
+        if mode == "eager":
+            self.report = warm_icon_cache()
+        elif mode == "lazy":
+            # warm in the background so the first page renders right away
+            self.thread = threading.Thread(target=self._run, name="icon-warmup", daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        self.report = warm_icon_cache()
+
+    @property
+    def done(self) -> bool:
+        return self.report is not None
+
+
+@st.cache_resource(show_spinner=False)
+def start_icon_warmup(mode: str = ICON_WARMUP) -> IconWarmup:
+    # cache_resource: runs once per server process and is shared by every session
+    configure_logging()
+    return IconWarmup(mode)
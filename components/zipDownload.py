@@ -2,102 +2,48 @@ from components.pdf import create_pdf
 import streamlit as st
 import io
 import zipfile
-import openpyxl
-import pandas as pd
-from openpyxl.utils import get_column_letter
-from typing import Dict, List, Set
+from typing import Dict
 
 from components.pdf_profesionnal import create_pdf_professional
+from components.excel import overview_excel
+from components.export_cache import content_hash
+from components.export_service import export_download_button, scaled_progress
+from components.tooth_status import ToothFlag
 
-def combined_download_button():
-    # --- Generate Excel ---
-    excel_buffer = io.BytesIO()
-    manual_teeth: Dict[int, str] = st.session_state.get("manual_teeth", {})
-    ai_teeth: Dict[int, str] = st.session_state.get("ai_teeth", {})
-
-    data_sources: List[Dict[int, str]] = [manual_teeth, ai_teeth]
-    source_names: List[str] = ["Manual", "AI"]
-
-    def parse_tags(raw_value: str) -> List[str]:
-        if raw_value is None:
-            return []
-        pieces = [part.strip() for part in raw_value.split(",")]
-        return [p for p in pieces if p]
-
-    all_tags: Set[str] = {"normal"}
-    for src_dict in data_sources:
-        for value in src_dict.values():
-            for tag in parse_tags(value):
-                all_tags.add(tag)
-
-    rows: List[Dict[str, str]] = []
-
-    for src_name, src_dict in zip(source_names, data_sources):
-        row: Dict[str, str] = {"source": src_name}
-
-        # First, check for normal tag as a special case, since both None and normal count as normal
-        normal_keys: List[int] = []
-        for key, value in src_dict.items():
-            parsed = parse_tags(value)
-
-            if not parsed or "normal" in parsed:
-                normal_keys.append(key)
-
-        row["present"] = ", ".join(str(key) for key in normal_keys)
-
-        # Next, check for all other tags
-        for tag in sorted(all_tags):
-            if tag == "normal":
-                continue  # already handled
-
-            keys_with_this_tag: List[int] = []
-            for key, value in src_dict.items():
-                if tag in parse_tags(value):
-                    keys_with_this_tag.append(key)
-
-            row[tag] = ", ".join(str(k) for k in sorted(keys_with_this_tag))
-
-        rows.append(row)
-
-    df = pd.DataFrame(rows)
-
-    priority_cols = ["source", "missing"]
-    used_columns = [column for column in priority_cols] + ["normal", "present"]
-    remaining_cols = [tag for tag in all_tags if tag not in used_columns]
+def build_report_zip(manual_teeth, ai_teeth, patient_id, patient_name, scandate_str, birthdate, age, gender,
+                     manual_image_bytes, top_row, bottom_row, progress=None) -> bytes:
+    excel_buffer = overview_excel(manual_teeth, ai_teeth)
+    if progress is not None:
+        progress(0.05)
 
-    final_columns = [col for col in priority_cols if col in df.columns] + remaining_cols
-    df = df.reindex(columns=final_columns)
-
-    df = df.rename(columns={"df": "dental filling", "rcf": "root canal filling"})
-
-    df.columns = [col.capitalize() for col in df.columns]
-
-    with pd.ExcelWriter(excel_buffer, engine="openpyxl") as writer:
-        df.to_excel(writer, sheet_name="Overview", index=False)
-
-        worksheet: openpyxl.worksheet.worksheet.Worksheet = writer.book["Overview"]
-
-        for column in worksheet.columns:
-            max_length = 0
-            for cell in column:
-                cell_value = "" if cell.value is None else str(cell.value)
-                max_length = max(max_length, len(cell_value))
+    with open("icons/dentists-approved.png", "rb") as f:
+        sign_image_bytes = f.read()
 
-            # Remove some width to not have too much white space
-            # adjusted_width = max_length - 25
-            adjusted_width = max_length + 5
+    pdf_bytes = create_pdf_professional(
+        patient_id=patient_id,
+        patient_name=patient_name,
+        scan_date=scandate_str,
+        birth_date=birthdate,
+        age=age,
+        gender=gender,
+        pano_bytes=manual_image_bytes,
+        manual_teeth=manual_teeth,
+        top_row=top_row,
+        bottom_row=bottom_row,
+        sign_image_bytes=sign_image_bytes,
+        progress=scaled_progress(progress, 0.05, 0.95),
+    )
 
-            column_letter = get_column_letter(column[0].column)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w") as zf:
+        zf.writestr("DentalExcel.xlsx", excel_buffer.getvalue())
+        zf.writestr("Radiology_Report.pdf", pdf_bytes)
+    return zip_buffer.getvalue()
 
-    # rewind so Streamlit can read the buffer from start
-    excel_buffer.seek(0)
-    # Copy the logic from your `excel_button()` here but write to excel_buffer instead of triggering download
-    # NOTE: Extract only the inner logic that produces `buffer`, skip `st.download_button`
-    # For brevity, here we assume excel_buffer is already filled
 
-    # --- Generate PDF ---
-    manual_teeth = getattr(st.session_state, 'manual_teeth', {})
+def combined_download_button():
+    manual_teeth: Dict[int, ToothFlag] = st.session_state.get("manual_teeth", {})
+    ai_teeth: Dict[int, ToothFlag] = st.session_state.get("ai_teeth", {})
 
     top_row = list(reversed(range(11, 19))) + list(range(21, 29))
     bottom_row = list(reversed(range(41, 49))) + list(range(31, 39))
@@ -142,34 +88,15 @@ def combined_download_button():
 
     manual_image_bytes = st.session_state["manual_image_bytes"]
 
-    with open("icons/dentists-approved.png", "rb") as f:
-        sign_image_bytes = f.read()
-
-    pdf_bytes = create_pdf_professional(
-        patient_id=patient_id,
-        patient_name=patient_name,
-        scan_date=scandate_str,
-        birth_date=birthdate,
-        age=age,
-        gender=gender,
-        pano_bytes=manual_image_bytes,
-        manual_teeth=manual_teeth,
-        top_row=top_row,
-        bottom_row=bottom_row,
-        sign_image_bytes=sign_image_bytes
-    )
-
-    # --- Create ZIP ---
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w") as zf:
-        zf.writestr("DentalExcel.xlsx", excel_buffer.getvalue())
-        zf.writestr("Radiology_Report.pdf", pdf_bytes)
-
-    zip_buffer.seek(0)
+    # the Excel, the PDF and the ZIP are only rebuilt (in a worker process) when their content changed
+    key = content_hash(manual_teeth, ai_teeth, patient_id, patient_name, scandate_str, birthdate, age, gender,
+                       manual_image_bytes)
     latest_id = st.session_state.get("profile_number")
-    st.download_button(
+    export_download_button("report_zip", key, build_report_zip, dict(
+        manual_teeth=manual_teeth, ai_teeth=ai_teeth, patient_id=patient_id, patient_name=patient_name,
+        scandate_str=scandate_str, birthdate=birthdate, age=age, gender=gender,
+        manual_image_bytes=manual_image_bytes, top_row=top_row, bottom_row=bottom_row),
         label="📦 Download Report & Excel (ZIP)",
-        data=zip_buffer,
         file_name=f"patient_{latest_id}.zip",
         mime="application/zip",
     )
\ No newline at end of file
@@ -1,9 +1,10 @@
 import streamlit as st
 from components.excel import excel_button
 from components.teeth_renderer import render_teeth
-from input.teethSet import teeth as manualteeth
+from components.teeth_templates import MANUAL_TEMPLATE, new_dentition
 
 from components.sidebar import load_sidebar
+from components.warmup import start_icon_warmup
 import os
 from streamlit_cookies_controller import CookieController
 
@@ -22,10 +23,11 @@ st.set_page_config(page_title="AI vs. Human analysis: A smart comparison tool",
 try:
     manual_teeth =st.session_state.manual_teeth
 except:
-    st.session_state.manual_teeth=manualteeth
+    st.session_state.manual_teeth=new_dentition(MANUAL_TEMPLATE).adult
     print("no manual teeth found")
 
 load_sidebar("AI")
+start_icon_warmup()
 
 st.title("Welcome to the AI page!")
 if st.session_state.Professional:
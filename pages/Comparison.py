@@ -5,16 +5,16 @@ from components.excel import excel_button
 from components.pdf import pdf_button
 from components.zipDownload import combined_download_button
 from components.sidebar import load_sidebar
+from components.warmup import start_icon_warmup
 from components.teeth import load_teeth
-from input.teethSet import missingteeth as manualteeth, missingchildteeth as manualchildteeth
-from AIOutput.teethSet import teeth as AIteeth, childteeth as AIchildteeth
 from components.teeth import load_teeth, pil_to_data_url
 from components.teeth_renderer import check_checkbox_disabled, check_checkbox_status, toggle_tooth_presence, \
     show_options, render_button_row
-from input.teethSet import teeth as manualteeth
-from AIOutput.teethSet import teeth as AIteeth
+from components.teeth_templates import AI_TEMPLATE, MANUAL_TEMPLATE, MISSING_TEMPLATE, new_dentition
+from components.case_store import save_session_case
+from components.difference_tracker import get_difference_tracker, mark_corrected, notify_tooth_changed
 import os
-from components.teeth import get_tooth_image
+from components.teeth import get_tooth_image, get_chart_atlas, render_tooth_cell, render_tooth_thumbnail
 from components.pdf_profesionnal import pdf_button_professional
 
 st.set_page_config(page_title="comparison", layout="wide")
@@ -34,6 +34,7 @@ st.markdown("""
 
 
 def restart():
+    save_session_case(st.session_state)
     controller = CookieController()
     print(controller.getAll())
 
@@ -82,46 +83,29 @@ def switch_teeth():
         st.session_state.View="Adult"
     print(st.session_state.View)
 
-try:
-    manual_teeth = st.session_state.manual_teeth
-except:
-    manual_teeth = manualteeth
-    print("no manual teeth found")
+def session_teeth(key, template, child=False):
+    # the teeth of an earlier page, or a template dentition kept for the rest of the session,
+    # so edits and the difference tracker survive reruns
+    if key in st.session_state:
+        return st.session_state[key]
+    fallback_key = f"comparison_{key}"
+    if fallback_key not in st.session_state:
+        print(f"no {key} found")
+        dentition = new_dentition(template)
+        st.session_state[fallback_key] = dentition.child if child else dentition.adult
+    return st.session_state[fallback_key]
 
-try:
-    AI_teeth = st.session_state.ai_teeth
-except:
-    AI_teeth = AIteeth
 
-    print("no ai teeth found")
+manual_teeth = session_teeth("manual_teeth", MANUAL_TEMPLATE)
+AI_teeth = session_teeth("ai_teeth", AI_TEMPLATE)
 
 if st.session_state.get("customize_tooth", False):
     teeth = st.session_state.get("teeth_dict_manual")
     show_options(teeth)
 
 
-def normalize(value):
-    if value is None:
-        return None
-    return set(map(str.strip, value.split(",")))
-
-
-def compair(manualteeth, AIteeth) -> dict[int, str | None]:
-    differences = {}
-    for tooth in AIteeth:
-        user_val = manualteeth[tooth]
-        ai_val = AIteeth[tooth]
-
-        norm_user = normalize(user_val)
-        norm_ai = normalize(ai_val)
-
-        if norm_user != norm_ai:
-            if not (norm_user == None and norm_ai == "normal") or not (norm_user == "normal" and norm_ai == None):
-                differences[tooth] = ai_val
-    return (differences)
-
-
 load_sidebar("Comparison")
+start_icon_warmup()
 
 if st.session_state.Teethkind == "Child":
     child = True
@@ -136,29 +120,11 @@ else:
     child = False
 
 if child:
-    try:
-        manual_teeth = st.session_state.manual_teeth_child
-    except:
-        manual_teeth = manualchildteeth
-        print("no manual teeth found")
-
-    try:
-        AI_teeth = st.session_state.ai_teeth_child
-    except:
-        AI_teeth = AIchildteeth
-    print("no ai teeth found")
+    manual_teeth = session_teeth("manual_teeth_child", MISSING_TEMPLATE, child=True)
+    AI_teeth = session_teeth("ai_teeth_child", AI_TEMPLATE, child=True)
 else:
-    try:
-        manual_teeth = st.session_state.manual_teeth
-    except:
-        manual_teeth = manualteeth
-        print("no manual teeth found")
-
-    try:
-        AI_teeth = st.session_state.ai_teeth
-    except:
-        AI_teeth = AIteeth
-        print("no ai teeth found")
+    manual_teeth = session_teeth("manual_teeth", MANUAL_TEMPLATE)
+    AI_teeth = session_teeth("ai_teeth", AI_TEMPLATE)
 
 st.title("Comparison page!")
 
@@ -184,14 +150,10 @@ def pick_correct_tooth(clicked_tooth_id):
                                key=f"radio_modal_difference")
 
     with columns[1]:
-        modal_tooth_pil_manual = get_tooth_image(
-            clicked_tooth_id, manual_teeth[clicked_tooth_id])
-        st.image(modal_tooth_pil_manual, width=40)
+        render_tooth_thumbnail(clicked_tooth_id, manual_teeth[clicked_tooth_id], width=40)
 
         if tooth_differences_value is not False:
-            modal_tooth_pil_ai = get_tooth_image(
-                clicked_tooth_id, tooth_differences_value)
-            st.image(modal_tooth_pil_ai, width=40)
+            render_tooth_thumbnail(clicked_tooth_id, tooth_differences_value, width=40)
         else:
             # Or handle appropriately
             st.write("AI data not available for this tooth.")
@@ -208,12 +170,9 @@ def pick_correct_tooth(clicked_tooth_id):
         if st.button("Save", key=f"save_modal_{clicked_tooth_id}", use_container_width=True, type="primary"):
             if radio_value == "ai":
                 manual_teeth[clicked_tooth_id] = AI_teeth[clicked_tooth_id]
+                notify_tooth_changed(manual_teeth, clicked_tooth_id)
 
-            if clicked_tooth_id in differences:
-                del differences[clicked_tooth_id]
-
-            if "corrected_teeth" in st.session_state:  # Check if it exists
-                st.session_state.corrected_teeth.add(clicked_tooth_id)
+            mark_corrected(clicked_tooth_id)
 
             st.session_state.modal_tooth_num = None
             st.rerun()
@@ -236,20 +195,22 @@ if st.session_state.get("modal_tooth_num", False):
 
 def load_diff_teeth_top(differences, teeth_list):
     cols = st.columns(len(teeth_list))
+    atlas = get_chart_atlas()
     for col, tooth in zip(cols, teeth_list):
         with col:
             if tooth in differences:
-                st.image(get_tooth_image(tooth, differences[tooth]))
+                render_tooth_cell(tooth, differences[tooth], atlas=atlas)
             else:
                 st.empty()
 
 
 def load_diff_teeth_bottom(differences, teeth_list):
     cols = st.columns(len(teeth_list))
+    atlas = get_chart_atlas()
     for col, tooth in zip(cols, teeth_list):
         with col:
             if tooth in differences:
-                st.image(get_tooth_image(tooth, differences[tooth]))
+                render_tooth_cell(tooth, differences[tooth], atlas=atlas)
             else:
                 st.empty()
 
@@ -269,12 +230,9 @@ if ai_image_bytes and manual_image_bytes:
             st.image(manual_image_bytes, use_container_width=True)
         with cols[1]:
             st.image(ai_image_bytes, use_container_width=True)
-    raw_differences = compair(manual_teeth, AI_teeth)
-    corrected_teeth = st.session_state.get("corrected_teeth", set())
-    differences = {}
-    for key, value in raw_differences.items():
-        if key not in corrected_teeth:
-            differences[key] = value
+    # compared once per view, edits in the dialogs update it tooth by tooth
+    difference_tracker = get_difference_tracker(manual_teeth, AI_teeth, "child" if child else "adult")
+    differences = difference_tracker.pending
 
     st.markdown("""
     <style>
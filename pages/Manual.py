@@ -1,11 +1,12 @@
 import streamlit as st
 from st_pages import Page, add_page_title
-import AIOutput.teethSet
-from input.teethSet import missingteeth, missingchildteeth
 from components.pdf_profesionnal import pdf_button_professional
 from components.teeth_renderer import render_teeth
 from components.sidebar import load_sidebar
+from components.warmup import start_icon_warmup
 from components.teeth import load_teeth
+from components.case_store import snapshot_manual
+from components.teeth_templates import AI_TEMPLATE, MISSING_TEMPLATE, new_dentition
 import os
 
 if "go_to_upload_page" not in st.session_state:
@@ -19,6 +20,7 @@ st.set_page_config(page_title="AI vs. Human analysis: A smart comparison tool",
                    layout="wide")
 
 load_sidebar("Manual")
+start_icon_warmup()
 
 st.title("Welcome to the manual page!")
 
@@ -69,7 +71,7 @@ def do_AI():
     image_path = os.path.join("AIOutput", "image.jpg")
     if os.path.exists(image_path):
         # Full import path to clearly show this comes from another file!!
-        st.session_state.ai_teeth = AIOutput.teethSet.teeth
+        st.session_state.ai_teeth = new_dentition(AI_TEMPLATE).adult
         with open(image_path, "rb") as img_file:
             st.session_state.AI_image_bytes = img_file.read()
 
@@ -126,9 +128,10 @@ if "manual_image_bytes" in st.session_state:
             do_AI()
             st.session_state.submitted_manual_teeth = True
             if st.session_state.Teethkind == "Child":
-                st.session_state.teeth_dict_manual = missingteeth
+                st.session_state.teeth_dict_manual = new_dentition(MISSING_TEMPLATE).adult
             if st.session_state.Teethkind == "Adult":
-                st.session_state.childteeth_dict_manual =missingchildteeth
+                st.session_state.childteeth_dict_manual = new_dentition(MISSING_TEMPLATE).child
+            st.session_state.submitted_manual = snapshot_manual(st.session_state)
             if st.session_state.Professional:
                 st.switch_page("pages/Comparison.py")
             else:
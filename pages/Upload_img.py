@@ -1,6 +1,7 @@
 from st_pages import Page, add_page_title
 import streamlit as st
 from components.sidebar import load_sidebar
+from components.warmup import start_icon_warmup
 import os
 
 
@@ -37,6 +38,7 @@ def upload_files():
 
 # layout
 load_sidebar("Upload")
+start_icon_warmup()
 
 st.header("Upload Dental image")
 st.markdown("""
@@ -1,3 +1,4 @@
 #!/bin/bash
 set -e
+python -m scripts.prebuild_icons
 exec streamlit run app.py --server.headless true --server.address 0.0.0.0 --server.port ${PORT:-8000}
\ No newline at end of file
@@ -0,0 +1,169 @@
+# Headless report generation for a whole cohort: the student Radiology Report (PDF), the Excel
+# overview and a ZIP with both, for every case of a directory or manifest.
+# A case is a JSON object:
+#   {"case_id": "...", "rnumber": "r0123456", "student_name": "...", "patient_id": "12", "scan_date": "2025-05-20",
+#    "age": "40", "gender": "F", "manual": {"16": "normal,df", ...}, "ai": {...},
+#    "manual_image": "pano.jpeg", "ai_image": "pano.jpeg"}
+# Teeth are the adult FDI numbers with a status string or ToothFlag value, "ai" defaults to the AIOutput teeth, "ai_image" to "manual_image",
+# image paths are relative to the case file.
+# Sources: a directory with one <case>.json per case, or a .jsonl manifest with one case per line.
+# Finished cases are skipped on the next run, so an interrupted run picks up where it stopped.
+# run from the repository root: python -m scripts.class_reports cases/ out/ --workers 4
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from components.dentition import Dentition
+from components.excel import overview_excel
+from components.pdf import create_pdf
+from components.teeth_templates import AI_TEMPLATE, new_dentition
+
+TOP_ROW = list(reversed(range(11, 19))) + list(range(21, 29))
+BOTTOM_ROW = list(reversed(range(41, 49))) + list(range(31, 39))
+OUTPUTS = (".pdf", ".xlsx", ".zip")
+
+
+def read_cases(source: str) -> list[dict]:
+    cases = []
+    if os.path.isdir(source):
+        for file_name in sorted(os.listdir(source)):
+            if file_name.endswith(".json"):
+                with open(os.path.join(source, file_name), encoding="utf-8") as f:
+                    case = json.load(f)
+                case.setdefault("case_id", os.path.splitext(file_name)[0])
+                case["base_dir"] = source
+                cases.append(case)
+    else:
+        with open(source, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    case = json.loads(line)
+                    case.setdefault("case_id", f"case_{line_number:05d}")
+                    case["base_dir"] = os.path.dirname(os.path.abspath(source))
+                    cases.append(case)
+
+    check_case_ids(cases)
+    return cases
+
+
+def check_case_ids(cases: list[dict]):
+    # ids become output file names, anything that could leave out_dir is rejected
+    seen = set()
+    for case in cases:
+        case_id = case["case_id"]
+        if (not isinstance(case_id, str) or case_id in ("", ".", "..") or "\0" in case_id
+                or "/" in case_id or "\\" in case_id or os.path.basename(case_id) != case_id):
+            raise ValueError(f"invalid case id {case_id!r}, it must be a plain file name")
+        if case_id in seen:
+            raise ValueError(f"duplicate case id {case_id!r}")
+        seen.add(case_id)
+
+
+def output_paths(out_dir: str, case_id: str) -> list[str]:
+    return [os.path.join(out_dir, case_id + suffix) for suffix in OUTPUTS]
+
+
+def is_done(out_dir: str, case_id: str) -> bool:
+    # outputs are only ever renamed into place complete, so existing means finished
+    return all(os.path.exists(path) for path in output_paths(out_dir, case_id))
+
+
+def write_atomic(path: str, data: bytes):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def case_dentition(teeth: dict) -> Dentition:
+    # JSON object keys are strings
+    return Dentition({int(tooth): status for tooth, status in teeth.items()}).adult
+
+
+def read_image(case: dict, key: str) -> bytes:
+    with open(os.path.join(case["base_dir"], case[key]), "rb") as f:
+        return f.read()
+
+
+def build_case(case: dict, out_dir: str) -> tuple[str, float]:
+    start = time.perf_counter()
+    manual = case_dentition(case["manual"])
+    ai = case_dentition(case["ai"]) if case.get("ai") is not None else new_dentition(AI_TEMPLATE).adult
+    manual_image = read_image(case, "manual_image")
+    ai_image = read_image(case, "ai_image") if case.get("ai_image") else manual_image
+
+    pdf_bytes = create_pdf(
+        rnumber=case.get("rnumber") or "Unknown",
+        student_name=case.get("student_name") or "Unknown",
+        patient_id=str(case.get("patient_id") or "Unknown"),
+        scan_date=case.get("scan_date") or "Unknown",
+        age=str(case.get("age") or "Unknown"),
+        gender=case.get("gender") or "Unknown",
+        pano1_bytes=manual_image,
+        pano2_bytes=ai_image,
+        manual_teeth=manual,
+        ai_teeth=ai,
+        top_row=TOP_ROW,
+        bottom_row=BOTTOM_ROW,
+    )
+    excel_bytes = overview_excel(manual, ai).getvalue()
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w") as zf:
+        zf.writestr("Radiology_Report.pdf", pdf_bytes)
+        zf.writestr("DentalExcel.xlsx", excel_bytes)
+
+    pdf_path, excel_path, zip_path = output_paths(out_dir, case["case_id"])
+    write_atomic(pdf_path, pdf_bytes)
+    write_atomic(excel_path, excel_bytes)
+    # written last: its presence marks the case as done
+    write_atomic(zip_path, zip_buffer.getvalue())
+    return case["case_id"], time.perf_counter() - start
+
+
+def generate(cases: list[dict], out_dir: str, workers: int = 0, force: bool = False, verbose: bool = True) -> dict:
+    check_case_ids(cases)
+    os.makedirs(out_dir, exist_ok=True)
+    todo = [case for case in cases if force or not is_done(out_dir, case["case_id"])]
+    stats = {"cases": len(cases), "built": 0, "skipped": len(cases) - len(todo), "failed": 0}
+    if stats["skipped"] and verbose:
+        print(f"skipping {stats['skipped']} finished cases")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {pool.submit(build_case, case, out_dir): case["case_id"] for case in todo}
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                case_id, seconds = future.result()
+                stats["built"] += 1
+                if verbose:
+                    print(f"[{done}/{len(todo)}] {case_id} ({seconds:.2f}s)")
+            except Exception as e:
+                stats["failed"] += 1
+                print(f"[{done}/{len(todo)}] {futures[future]} failed: {e}", file=sys.stderr)
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["reports_per_second"] = stats["built"] / stats["seconds"] if stats["built"] else 0.0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the reports of a cohort of cases")
+    parser.add_argument("source", help="directory with one .json per case, or a .jsonl manifest")
+    parser.add_argument("out_dir", help="where <case_id>.pdf, .xlsx and .zip are written")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="rebuild cases that are already finished")
+    args = parser.parse_args()
+
+    stats = generate(read_cases(args.source), args.out_dir, workers=args.workers, force=args.force)
+    print(f"built {stats['built']}, skipped {stats['skipped']}, failed {stats['failed']} "
+          f"in {stats['seconds']:.1f}s ({stats['reports_per_second']:.2f} reports/sec)")
+    sys.exit(1 if stats["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
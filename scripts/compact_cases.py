@@ -0,0 +1,24 @@
+# Merge the case store's one-file-per-case parts into one file per day, so cohort queries
+# read a few large row groups and can skip them by their statistics.
+# Meant for a daily cron job; today's partition is left for the app to keep appending to.
+# run from the repository root: python -m scripts.compact_cases [--root data/cases]
+import argparse
+import time
+
+from components.case_store import compact_cases
+from components.settings import CASE_STORE_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact the case store's daily partitions")
+    parser.add_argument("--root", default=CASE_STORE_DIR, help="case store directory")
+    parser.add_argument("--before", help="only days before this date (YYYY-MM-DD), default today")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = compact_cases(args.root, before=args.before)
+    print(f"compacted {count} partitions in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# Build step: write every tooth icon at every height the app renders into a
+# versioned directory under static/icons, plus a manifest the app reads at runtime,
+# pack all of them into one memory-mapped icon store (build/icons.pack), and pack
+# the chart icons into one sprite atlas per variant under static/atlas.
+# run from the repository root: python -m scripts.prebuild_icons
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from PIL import Image
+
+from components.icon_assets import ICON_VARIANT_DIRS, PRESCALED_ROOT, PRESCALED_MANIFEST, MANIFEST_SCHEMA, \
+    prescaled_key, resize_icon, source_icon_paths, load_manifest, load_all_icons
+from components.sprite_atlas import ATLAS_ROOT, ATLAS_MANIFEST, atlas_name, write_atlas, \
+    read_manifest as read_atlas_manifest, write_manifest as write_atlas_manifest
+from components.icon_store import ICON_STORE_PATH, SOURCE_HEIGHT, IconStore, write_icon_store
+from components import pdf, pdf_profesionnal
+
+UI_TOOTH_H = 80  # default height of get_tooth_image, used by the charts and the comparison rows
+MODAL_THUMBNAIL_H = 40  # tooth thumbnails in the comparison modal
+
+
+def render_heights() -> list[int]:
+    heights = {
+        UI_TOOTH_H,
+        MODAL_THUMBNAIL_H,
+        # components.pdf.tooth_image rasterizes at height_pt * RASTER_SCALE
+        int(pdf.TOOTH_H_PT * pdf.RASTER_SCALE),
+        int(pdf_profesionnal.TOOTH_H_PT_LARGE * pdf.RASTER_SCALE),
+    }
+    return sorted(heights)
+
+
+def asset_version(variants, heights) -> str:
+    digest = hashlib.sha1(json.dumps([MANIFEST_SCHEMA, list(variants), list(heights)]).encode())
+    for icon_variant in variants:
+        root = ICON_VARIANT_DIRS[icon_variant]
+        for icon_path in source_icon_paths(icon_variant):
+            digest.update(f"{icon_variant}/{icon_path}".encode())
+            with open(os.path.join(root, icon_path), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def current_version() -> str | None:
+    try:
+        with open(PRESCALED_MANIFEST, encoding="utf-8") as f:
+            return json.load(f).get("version")
+    except (OSError, ValueError):
+        return None
+
+
+def build(variants=tuple(ICON_VARIANT_DIRS), heights=None, force=False) -> dict:
+    heights = heights or render_heights()
+    version = asset_version(variants, heights)
+    if not force and current_version() == version:
+        print(f"pre-scaled icons are up to date ({version})")
+        return {"version": version, "built": 0}
+
+    start = time.perf_counter()
+    out_root = os.path.join(PRESCALED_ROOT, version)
+    files = {}
+    for icon_variant in variants:
+        src_root = ICON_VARIANT_DIRS[icon_variant]
+        for icon_path in source_icon_paths(icon_variant):
+            with Image.open(os.path.join(src_root, icon_path)) as src:
+                src.load()
+                for height in heights:
+                    key = prescaled_key(icon_variant, height, icon_path)
+                    out_path = os.path.join(out_root, key)
+                    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                    resized = resize_icon(src, height)
+                    resized.save(out_path, format="PNG")
+                    files[key] = list(resized.size)
+
+    manifest = {
+        "schema": MANIFEST_SCHEMA,
+        "version": version,
+        "variants": list(variants),
+        "heights": list(heights),
+        "files": files,
+    }
+    tmp_path = PRESCALED_MANIFEST + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, PRESCALED_MANIFEST)
+
+    # drop the asset directories of older builds
+    for entry in os.listdir(PRESCALED_ROOT):
+        path = os.path.join(PRESCALED_ROOT, entry)
+        if entry != version and os.path.isdir(path):
+            shutil.rmtree(path)
+
+    elapsed = time.perf_counter() - start
+    print(f"wrote {len(files)} pre-scaled icons ({version}) in {elapsed:.1f}s")
+    return {"version": version, "built": len(files)}
+
+
+def build_atlases(variants=tuple(ICON_VARIANT_DIRS), heights=(UI_TOOTH_H,), force=False) -> dict:
+    icons_version = current_version()
+    entries = read_atlas_manifest()
+    for icon_variant in variants:
+        for height in heights:
+            name = atlas_name(icon_variant, height)
+            entry = entries.get(name)
+            if (not force and entry and entry.get("icons_version") == icons_version
+                    and os.path.exists(os.path.join(ATLAS_ROOT, entry["file"]))):
+                continue
+            entry = write_atlas(icon_variant, height, load_all_icons(icon_variant, height))
+            entry["icons_version"] = icons_version
+            entries[name] = entry
+            print(f"wrote sprite atlas {entry['file']} ({entry['width']}x{entry['height']})")
+    write_atlas_manifest(entries)
+
+    # drop atlases no manifest entry points at anymore
+    keep = {entry["file"] for entry in entries.values()} | {os.path.basename(ATLAS_MANIFEST)}
+    for file_name in os.listdir(ATLAS_ROOT):
+        if file_name not in keep:
+            os.remove(os.path.join(ATLAS_ROOT, file_name))
+    return entries
+
+
+def build_icon_store(force=False) -> int:
+    manifest = load_manifest()
+    if manifest is None:
+        return 0
+    version = manifest["version"]
+    if not force and os.path.exists(ICON_STORE_PATH):
+        try:
+            if IconStore(ICON_STORE_PATH).version == version:
+                return 0
+        except ValueError:
+            pass
+
+    def images():
+        for icon_variant in manifest["variants"]:
+            src_root = ICON_VARIANT_DIRS[icon_variant]
+            for icon_path in source_icon_paths(icon_variant):
+                with open(os.path.join(src_root, icon_path), "rb") as f:
+                    yield icon_variant, SOURCE_HEIGHT, icon_path, f.read()
+                for height in manifest["heights"]:
+                    prescaled = os.path.join(PRESCALED_ROOT, version, prescaled_key(icon_variant, height, icon_path))
+                    with Image.open(prescaled) as img:
+                        yield icon_variant, height, icon_path, img
+
+    count = write_icon_store(ICON_STORE_PATH, images(), version)
+    print(f"packed {count} icons into {ICON_STORE_PATH} ({os.path.getsize(ICON_STORE_PATH) / 1e6:.1f} MB)")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-scale tooth icons for every render height")
+    parser.add_argument("--height", type=int, action="append", dest="heights",
+                        help="render height in px (repeatable, defaults to every height the app uses)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the manifest is current")
+    args = parser.parse_args()
+    build(heights=sorted(set(args.heights)) if args.heights else None, force=args.force)
+    build_icon_store(force=args.force)
+    build_atlases(force=args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,6 @@
 from streamlit.testing.v1 import AppTest
 import pytest
 
-
-import os
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 from components.sidebar import load_sidebar
 
 def test_sidebar_loads_correctly_not_logged_in():
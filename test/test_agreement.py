@@ -0,0 +1,44 @@
+import math
+
+import numpy as np
+
+from AIOutput.teethSet import teeth as ai_teeth
+from components.agreement import AGREEMENT_LABELS, agreement_stats, confusion_counts
+from components.dentition import Dentition
+from components.tooth_status import ToothFlag, parse_status
+from input.teethSet import teeth as manual_teeth
+
+F = ToothFlag
+
+
+def test_counts_match_per_tooth_loop():
+    manual = {11: "normal,df", 12: "missing", 13: "normal,df,rcf", 14: None, 15: "missing,implant"}
+    ai = {11: "normal,df", 12: "normal", 13: "normal,crown,rcf", 14: "missing", 15: "missing,implant,crown"}
+    stats = agreement_stats(manual, ai)
+    for label in AGREEMENT_LABELS:
+        ref = [label in parse_status(manual[n]) for n in manual]
+        pred = [label in parse_status(ai[n]) for n in manual]
+        row = stats[label]
+        assert row.tp == sum(r and p for r, p in zip(ref, pred))
+        assert row.fp == sum(p and not r for r, p in zip(ref, pred))
+        assert row.fn == sum(r and not p for r, p in zip(ref, pred))
+        assert row.total == len(manual)
+
+
+def test_metrics():
+    # 8 teeth: tp=2, fp=1, fn=1, tn=4
+    stats = agreement_stats({n: s for n, s in zip(range(11, 19), ["missing"] * 3 + [None] * 5)},
+                            {n: s for n, s in zip(range(11, 19), ["missing", "missing", None, "missing"] + [None] * 4)})
+    row = stats[F.MISSING]
+    assert (row.tp, row.fp, row.fn, row.tn) == (2, 1, 1, 4)
+    assert row.precision == row.recall == row.f1 == 2 / 3
+    assert math.isclose(row.kappa, (6 / 8 - (3 * 3 + 5 * 5) / 64) / (1 - (3 * 3 + 5 * 5) / 64))
+    # a label neither side used
+    assert math.isnan(stats[F.IMPLANT].precision) and stats[F.IMPLANT].kappa == 1.0
+
+
+def test_stacks_add_up():
+    manual, ai = Dentition(manual_teeth).adult, Dentition(ai_teeth).adult
+    single = confusion_counts(manual, ai)
+    assert np.array_equal(confusion_counts([manual] * 3, [ai] * 3), single * 3)
+    assert confusion_counts(manual, ai).sum(axis=1).tolist() == [32] * len(AGREEMENT_LABELS)
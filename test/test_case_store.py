@@ -0,0 +1,78 @@
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pyarrow.dataset as ds
+
+from components.agreement import agreement_stats
+from components.case_store import append_cases, case_dataset, case_flags, case_from_session, case_record, \
+    compact_cases, load_cases, save_session_case
+from components.dentition import Dentition
+from components.teeth_templates import AI_TEMPLATE, MANUAL_TEMPLATE, new_dentition
+from components.tooth_status import ToothFlag
+
+
+def make_case(role, day, manual_status="normal,df"):
+    manual = new_dentition(MANUAL_TEMPLATE)
+    manual[16] = manual_status
+    corrected = manual.copy()
+    corrected[16] = AI_TEMPLATE[16]
+    return case_record(manual, AI_TEMPLATE, corrected, role, corrected_teeth={16},
+                       created_at=datetime(2025, 5, day, 12, tzinfo=timezone.utc))
+
+
+def test_append_and_query(tmp_path):
+    root = str(tmp_path)
+    append_cases([make_case("student", 1), make_case("professional", 1)], root=root)
+    append_cases([make_case("student", 2, "missing")], root=root)
+    assert sorted(os.listdir(root)) == ["submitted_on=2025-05-01", "submitted_on=2025-05-02"]
+
+    students = load_cases(ds.field("role") == "student", root=root)
+    assert students.num_rows == 2
+    assert students.column("corrected_teeth").to_pylist() == [[16], [16]]
+
+    later = load_cases(ds.field("submitted_on") >= "2025-05-02", root=root)
+    manual = case_flags(later, "manual")
+    assert manual.shape == (1, 52) and manual.dtype == np.uint8
+    assert Dentition._view(manual[0], 0, Dentition().teeth)[16] == ToothFlag.MISSING
+
+    cases = load_cases(root=root)
+    stats = agreement_stats(case_flags(cases, "manual"), case_flags(cases, "ai"))
+    assert stats[ToothFlag.MISSING].fn == 1
+
+
+def test_session_case_is_saved_once(tmp_path, monkeypatch):
+    monkeypatch.setattr("components.case_store.CASE_STORE_DIR", str(tmp_path))
+    session = {"Professional": False, "Teethkind": "Adult", "rnumber": "r0123456"}
+    assert not save_session_case(session)
+
+    manual = new_dentition(MANUAL_TEMPLATE)
+    session.update(submitted_manual_teeth=True, teeth_dict_manual=manual.adult, ai_teeth=new_dentition(AI_TEMPLATE).adult)
+    session["submitted_manual"] = manual.copy()
+    manual[11] = "missing"
+    record = case_from_session(session)
+    assert record["manual"][0] == 0 and record["corrected"][0] == ToothFlag.MISSING
+    assert record["ai"] == AI_TEMPLATE.flags.tolist()
+
+    assert save_session_case(session) and session["case_saved"]
+    assert not save_session_case(session)
+    assert load_cases(root=str(tmp_path)).column("rnumber").to_pylist() == ["r0123456"]
+
+
+def test_compaction_lets_filters_skip_row_groups(tmp_path):
+    root = str(tmp_path)
+    for role in ("student", "professional") * 3:
+        append_cases([make_case(role, 1)], root=root)
+    append_cases([make_case("student", 2)], root=root)
+
+    assert compact_cases(root, before="2025-05-02", row_group_rows=3) == 1
+    assert len(os.listdir(tmp_path / "submitted_on=2025-05-01")) == 1
+    assert len(os.listdir(tmp_path / "submitted_on=2025-05-02")) == 1
+    assert load_cases(root=root).num_rows == 7
+
+    # sorted by role, so each row group holds one role and its statistics rule the other out
+    students = ds.field("role") == "student"
+    fragment, = case_dataset(root).get_fragments(ds.field("submitted_on") == "2025-05-01")
+    assert fragment.num_row_groups == 2
+    assert len(fragment.split_by_row_group(students)) == 1
+    assert load_cases(students, root=root).num_rows == 4
@@ -0,0 +1,49 @@
+import json
+import os
+import zipfile
+
+import pytest
+from PIL import Image
+
+from scripts.class_reports import generate, read_cases
+
+
+def write_cases(tmp_path, count):
+    Image.new("RGB", (120, 60), "gray").save(tmp_path / "pano.jpeg")
+    cases_dir = tmp_path / "cases"
+    cases_dir.mkdir()
+    for i in range(count):
+        case = {"rnumber": f"r{i}", "manual": {"16": "normal,df", "26": "missing"}, "manual_image": "../pano.jpeg"}
+        (cases_dir / f"case_{i}.json").write_text(json.dumps(case))
+    return read_cases(str(cases_dir))
+
+
+def test_generate_builds_all_outputs_and_resumes(tmp_path):
+    cases = write_cases(tmp_path, 2)
+    out_dir = tmp_path / "out"
+    stats = generate(cases, str(out_dir), workers=1, verbose=False)
+    assert (stats["built"], stats["skipped"], stats["failed"]) == (2, 0, 0)
+    assert sorted(os.listdir(out_dir)) == [f"case_{i}{suffix}" for i in range(2) for suffix in (".pdf", ".xlsx", ".zip")]
+    with zipfile.ZipFile(out_dir / "case_0.zip") as zf:
+        assert sorted(zf.namelist()) == ["DentalExcel.xlsx", "Radiology_Report.pdf"]
+
+    # a case without its zip counts as unfinished
+    os.remove(out_dir / "case_1.zip")
+    stats = generate(cases, str(out_dir), workers=1, verbose=False)
+    assert (stats["built"], stats["skipped"]) == (1, 1)
+
+
+def test_failed_case_does_not_stop_the_run(tmp_path):
+    cases = write_cases(tmp_path, 2)
+    cases[0]["manual_image"] = "missing.jpeg"
+    stats = generate(cases, str(tmp_path / "out"), workers=1, verbose=False)
+    assert (stats["built"], stats["failed"]) == (1, 1)
+    assert not os.path.exists(tmp_path / "out" / "case_0.zip")
+
+
+@pytest.mark.parametrize("case_id", ["../escaped", "sub/case", "..", ""])
+def test_case_ids_must_be_plain_file_names(tmp_path, case_id):
+    manifest = tmp_path / "cases.jsonl"
+    manifest.write_text(json.dumps({"case_id": case_id, "manual": {}, "manual_image": "pano.jpeg"}) + "\n")
+    with pytest.raises(ValueError, match="invalid case id"):
+        read_cases(str(manifest))
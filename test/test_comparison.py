@@ -0,0 +1,45 @@
+import numpy as np
+
+from AIOutput.teethSet import teeth as ai_teeth
+from components.comparison import compare_dentitions, flag_array
+from components.dentition import ADULT_TEETH, Dentition
+from components.tooth_status import ToothFlag
+from input.teethSet import teeth as manual_teeth
+
+
+def test_none_and_normal_are_the_same():
+    manual = Dentition({11: None, 12: "normal", 13: "normal,df"}).adult
+    ai = Dentition({11: "normal", 12: None, 13: "normal"}).adult
+    diff = compare_dentitions(manual, ai)
+    assert diff.differing_teeth() == [13]
+    assert diff.flag_counts()[ToothFlag.DF] == 1
+    assert sum(diff.flag_counts().values()) == 1
+
+
+def test_matches_per_tooth_loop():
+    diff = compare_dentitions(Dentition(manual_teeth).adult, Dentition(ai_teeth).adult)
+    norm = lambda status: status or "normal"
+    expected = [n for n in ADULT_TEETH if norm(manual_teeth[n]) != norm(ai_teeth[n])]
+    assert diff.differing_teeth() == expected
+
+
+def test_disagreement_per_flag():
+    diff = compare_dentitions({16: "normal,df,rcf"}, {16: "normal,crown,rcf"})
+    assert diff.mask.tolist() == [True]
+    assert diff.flag_mask(ToothFlag.DF).tolist() == [True]
+    assert diff.flag_mask(ToothFlag.CROWN).tolist() == [True]
+    assert diff.flag_mask(ToothFlag.RCF).tolist() == [False]
+
+
+def test_stacks_of_dentitions():
+    manual = [Dentition(manual_teeth), Dentition({16: "missing"})]
+    ai = [Dentition(ai_teeth), Dentition({16: "missing"})]
+    diff = compare_dentitions(manual, ai)
+    assert diff.mask.shape == (2, 52)
+    assert diff.disagreement.shape == (2, 52, 8)
+    assert diff.differing_teeth(1) == []
+    assert diff.differing_teeth(0) == compare_dentitions(manual[0], ai[0]).differing_teeth()
+
+    flags, teeth = flag_array(manual, ADULT_TEETH)
+    assert flags.shape == (2, 32) and teeth == ADULT_TEETH
+    assert np.array_equal(flags[0], Dentition(manual_teeth).adult.flags)
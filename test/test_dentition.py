@@ -0,0 +1,51 @@
+import pickle
+
+import pytest
+
+from AIOutput.teethSet import teeth as ai_teeth, childteeth as ai_childteeth
+from components.dentition import ADULT_TEETH, CHILD_TEETH, FDI_TEETH, Dentition
+from components.tooth_status import ToothFlag
+
+
+def test_dentition_round_trips_teeth_sets():
+    dentition = Dentition({**ai_teeth, **ai_childteeth})
+    assert len(dentition) == 52
+    assert dentition.adult.to_dict() == ai_teeth
+    assert dentition.child.to_dict() == ai_childteeth
+    assert dentition[16] == ToothFlag.NORMAL | ToothFlag.DF | ToothFlag.RCF
+    assert dentition[11] == 0
+
+
+def test_views_share_the_array():
+    dentition = Dentition()
+    adult, child = dentition.adult, dentition.child
+    assert adult.flags.base is dentition.flags
+    assert list(adult) == list(ADULT_TEETH) and list(child) == list(CHILD_TEETH)
+
+    adult[11] = "missing"
+    child[54] = ToothFlag.NORMAL | ToothFlag.CROWN
+    assert dentition[11] == ToothFlag.MISSING
+    assert dentition[54] == ToothFlag.NORMAL | ToothFlag.CROWN
+
+
+def test_dict_facade():
+    adult = Dentition(ai_teeth).adult
+    assert dict(adult.items()) == {tooth: adult[tooth] for tooth in ADULT_TEETH}
+    assert adult == {tooth: adult[tooth] for tooth in ADULT_TEETH}
+    assert 51 not in adult and 51 in Dentition()
+    assert adult.get(51, "default") == "default"
+    with pytest.raises(KeyError):
+        adult[51] = "normal"
+    with pytest.raises(KeyError):
+        Dentition()[19]
+
+
+def test_copy_and_pickle_are_independent():
+    dentition = Dentition(ai_teeth)
+    clone = dentition.copy()
+    clone[16] = None
+    assert dentition[16] and not clone[16]
+
+    restored = pickle.loads(pickle.dumps(dentition.child))
+    assert list(restored) == list(CHILD_TEETH)
+    assert len(FDI_TEETH) == len(set(FDI_TEETH)) == 52
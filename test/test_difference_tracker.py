@@ -0,0 +1,68 @@
+from AIOutput.teethSet import teeth as ai_teeth
+from components.comparison import compare_dentitions
+from components.dentition import Dentition
+from components.difference_tracker import DifferenceTracker
+from components.tooth_status import ToothFlag
+from input.teethSet import teeth as manual_teeth
+
+
+def make_tracker():
+    return DifferenceTracker(Dentition(manual_teeth).adult, Dentition(ai_teeth).adult)
+
+
+def test_initial_differences_match_full_compare():
+    tracker = make_tracker()
+    expected = compare_dentitions(tracker.manual, tracker.ai).differing_teeth()
+    assert sorted(tracker.differences) == expected
+    assert list(tracker.pending) == expected
+    assert tracker.pending[16] == tracker.ai[16]
+
+
+def test_single_tooth_updates():
+    tracker = make_tracker()
+    tracker.manual[16] = tracker.ai[16]
+    assert tracker.tooth_changed(tracker.manual, 16)
+    assert 16 not in tracker.differences and tracker.version == 1
+
+    tracker.manual[11] = ToothFlag.MISSING
+    tracker.tooth_changed(tracker.manual, 11)
+    assert 11 in tracker.pending
+
+    # None and "normal" are the same
+    tracker.manual[11] = ToothFlag.NORMAL
+    tracker.tooth_changed(tracker.manual, 11)
+    assert 11 not in tracker.differences
+
+    # edits of unrelated teeth dicts are ignored
+    assert not tracker.tooth_changed(Dentition().adult, 17)
+    assert tracker.version == 3
+
+
+def test_corrected_teeth_are_hidden():
+    tracker = make_tracker()
+    before = tracker.pending
+    tracker.mark_corrected(16)
+    assert 16 in before and 16 not in tracker.pending
+    assert 16 in tracker.differences
+    assert tracker.version == 1
+    tracker.mark_corrected(16)
+    assert tracker.version == 1
+
+
+def test_trackers_sharing_the_corrected_set():
+    manual, ai = Dentition(manual_teeth), Dentition(ai_teeth)
+    ai.child[51] = ToothFlag.MISSING
+    corrected = set()
+    adult = DifferenceTracker(manual.adult, ai.adult, corrected)
+    child = DifferenceTracker(manual.child, ai.child, corrected)
+    assert 51 in child.pending and 16 in adult.pending
+
+    # the first tracker adds the tooth to the shared set, the other one still has to drop it
+    for tracker in (adult, child):
+        tracker.mark_corrected(51)
+    assert 51 in corrected and 51 not in child.pending
+    assert adult.version == 0 and child.version == 1
+
+    for tracker in (child, adult):
+        tracker.mark_corrected(16)
+    assert 16 not in adult.pending and adult.version == 1
@@ -0,0 +1,42 @@
+import openpyxl
+
+from AIOutput.teethSet import teeth as ai_teeth
+from components.dentition import Dentition
+from components.excel import overview_excel, overview_frame, tag_index
+from components.tooth_status import status_tags
+from input.teethSet import teeth as manual_teeth
+
+
+def legacy_row(teeth, tags):
+    # what excel_button produced before the index: a rescan of every tooth per tag
+    return {tag: ", ".join(str(k) for k in sorted(k for k, v in teeth.items() if tag in status_tags(v))) for tag in tags}
+
+
+def test_tag_index():
+    index = tag_index(Dentition({11: None, 12: "normal,df", 13: "missing", 14: "normal,df,rcf"}).adult)
+    assert index["normal"][:3] == [11, 12, 14]
+    assert index["df"] == [12, 14] and index["rcf"] == [14] and index["missing"] == [13]
+
+
+def test_overview_matches_legacy_rows():
+    manual = Dentition(manual_teeth).adult
+    manual[16] = "missing,implant"
+    ai = Dentition(ai_teeth).adult
+    df = overview_frame({"Manual": manual, "AI": ai})
+    assert df.columns[:2].tolist() == ["Source", "Missing"]
+    assert set(df.columns) == {"Source", "Missing", "Dental filling", "Implant", "Crown", "Root canal filling"}
+
+    tags = ["missing", "df", "implant", "crown", "rcf"]
+    for row, teeth in zip(df.to_dict("records"), (manual, ai)):
+        expected = legacy_row(teeth, tags)
+        assert [row[c] for c in ("Missing", "Dental filling", "Implant", "Crown", "Root canal filling")] == \
+               [expected[t] for t in tags]
+
+
+def test_column_widths():
+    manual = Dentition(manual_teeth).adult
+    ai = Dentition(ai_teeth).adult
+    sheet = openpyxl.load_workbook(overview_excel(manual, ai))["Overview"]
+    for column in sheet.columns:
+        longest = max(len("" if cell.value is None else str(cell.value)) for cell in column)
+        assert sheet.column_dimensions[column[0].column_letter].width == longest + 5
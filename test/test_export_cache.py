@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+from components.export_cache import content_hash, memoized_export
+from components.teeth_templates import AI_TEMPLATE, new_dentition
+
+
+def test_content_hash():
+    teeth = new_dentition(AI_TEMPLATE)
+    key = content_hash(teeth.adult, "12345", b"pano")
+    assert key == content_hash(teeth.adult, "12345", b"pano")
+    assert key != content_hash(teeth.adult, "12345", b"pano2")
+    # same flags, other teeth
+    assert content_hash(teeth.adult) != content_hash(new_dentition(AI_TEMPLATE).child)
+    # parts can't run into each other
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    teeth.adult[16] = "missing"
+    assert key != content_hash(teeth.adult, "12345", b"pano")
+    assert content_hash({11: "normal"}) == content_hash({11: "normal"})
+
+
+def test_memoized_export_builds_once_per_content(monkeypatch):
+    monkeypatch.setattr("components.export_cache.st", SimpleNamespace(session_state={}))
+    builds = []
+
+    def build():
+        builds.append(1)
+        return b"%PDF" + bytes(len(builds))
+
+    first = memoized_export("pdf", "a", build)
+    assert memoized_export("pdf", "a", build) is first and len(builds) == 1
+    assert memoized_export("pdf", "b", build) != first and len(builds) == 2
+    assert memoized_export("zip", "b", build) and len(builds) == 3
@@ -0,0 +1,90 @@
+import threading
+import time
+
+from components.export_service import ExportService, scaled_progress
+
+
+def build_bytes(size: int, progress=None) -> bytes:
+    # module level, so a worker process can import it
+    for step in range(1, 5):
+        time.sleep(0.05)
+        if progress is not None:
+            progress(step / 4)
+    return b"x" * size
+
+
+def build_failing(progress=None) -> bytes:
+    raise ValueError("no pano")
+
+
+def wait(job, timeout=60):
+    deadline = time.monotonic() + timeout
+    while not job.done and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return job
+
+
+def test_inline_jobs_are_deduplicated():
+    service = ExportService(workers=0)
+    job = service.submit("a", build_bytes, {"size": 3})
+    assert job.status == "done" and job.data == b"xxx" and job.progress == 1.0
+    assert service.submit("a", build_bytes, {"size": 5}) is job
+
+    failed = service.submit("b", build_failing, {})
+    assert failed.status == "failed" and failed.error == "no pano"
+    # failed jobs are retried on the next submit
+    assert service.submit("b", build_failing, {}) is not failed
+
+
+def test_background_jobs_report_progress():
+    service = ExportService(workers=1)
+    try:
+        job = service.submit("a", build_bytes, {"size": 4})
+        assert not job.done
+        assert service.submit("a", build_bytes, {"size": 4}) is job
+        assert wait(job).status == "done"
+        assert job.data == b"xxxx" and job.progress == 1.0
+        assert service.get("a") is job
+
+        failed = wait(service.submit("b", build_failing, {}))
+        assert failed.status == "failed" and failed.error == "no pano"
+    finally:
+        service.shutdown()
+
+
+def test_shutdown_stops_the_result_reader():
+    before = set(threading.enumerate())
+    service = ExportService(workers=1)
+    assert wait(service.submit("a", build_bytes, {"size": 1})).status == "done"
+    reader, = [thread for thread in set(threading.enumerate()) - before if thread.name == "export-results"]
+    service.shutdown()
+    reader.join(timeout=30)
+    assert not reader.is_alive()
+    assert service._process.wait(timeout=30) == 0
+
+
+def test_dead_host_is_reaped_and_replaced():
+    service = ExportService(workers=1)
+    try:
+        assert wait(service.submit("a", build_bytes, {"size": 1})).status == "done"
+        host = service._process
+        host.kill()
+        # the reader thread waits for the dead host, so it doesn't stay behind as a zombie
+        deadline = time.monotonic() + 30
+        while host.returncode is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert host.returncode is not None
+
+        assert wait(service.submit("b", build_bytes, {"size": 2})).data == b"xx"
+        assert service._process is not host
+    finally:
+        service.shutdown()
+    assert service._process.returncode == 0
+
+
+def test_scaled_progress():
+    seen = []
+    report = scaled_progress(seen.append, 0.2, 0.6)
+    report(0.5)
+    assert seen == [0.4]
+    assert scaled_progress(None, 0, 1) is None
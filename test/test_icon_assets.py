@@ -0,0 +1,41 @@
+import json
+import os
+
+from PIL import Image
+
+from components.icon_assets import MANIFEST_SCHEMA, load_manifest
+from components.icon_store import get_icon_store, write_icon_store
+
+
+def write_manifest(path, version):
+    path.write_text(json.dumps({"schema": MANIFEST_SCHEMA, "version": version, "files": {}}))
+    # a distinct mtime even on filesystems with coarse timestamps
+    os.utime(path, ns=(version * 10**9, version * 10**9))
+
+
+def test_manifest_written_after_startup_is_picked_up(tmp_path):
+    path = tmp_path / "manifest.json"
+    assert load_manifest(str(path)) is None
+
+    write_manifest(path, 1)
+    manifest = load_manifest(str(path))
+    assert manifest["version"] == 1
+    assert load_manifest(str(path)) is manifest
+
+    write_manifest(path, 2)
+    assert load_manifest(str(path))["version"] == 2
+
+
+def test_icon_store_written_after_startup_is_picked_up(tmp_path):
+    path = str(tmp_path / "icons.pack")
+    assert get_icon_store(path) is None
+
+    write_icon_store(path, [("white", 80, "Icon_df/16.png", Image.new("RGBA", (4, 8)))], "v1")
+    os.utime(path, ns=(10**9, 10**9))
+    store = get_icon_store(path)
+    assert store.version == "v1"
+    assert get_icon_store(path) is store
+
+    write_icon_store(path, [("white", 80, "Icon_df/16.png", Image.new("RGBA", (4, 8)))], "v2")
+    os.utime(path, ns=(2 * 10**9, 2 * 10**9))
+    assert get_icon_store(path).version == "v2"
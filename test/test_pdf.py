@@ -0,0 +1,60 @@
+from io import BytesIO
+
+from PIL import Image
+from reportlab import rl_config
+from reportlab.platypus import SimpleDocTemplate, Table
+
+from components.pdf import binary_image_streams, make_scaled_image, pdf_image_cache, resample_image, tooth_image
+
+
+def encoded(mode, size, format):
+    buffer = BytesIO()
+    Image.new(mode, size).save(buffer, format=format)
+    return buffer.getvalue()
+
+
+def test_repeated_icons_are_embedded_once():
+    # 3 rows of the same 4 icons, each distinct icon becomes one image XObject plus its alpha mask
+    statuses = ["normal", "missing", "normal,df", "normal,crown"]
+    rows = [[tooth_image(16, status) for status in statuses] for _ in range(3)]
+    assert rows[0][0].reader is rows[2][0].reader
+
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer).build([Table(rows)])
+    assert buffer.getvalue().count(b"/Subtype /Image") == 2 * len(statuses)
+
+
+def test_pano_is_resampled_to_the_print_resolution():
+    pano = encoded("L", (3000, 1500), "JPEG")
+    img = make_scaled_image(pano, max_w=300, max_h=300, dpi=144)
+    # drawn at the same size as before, with two pixels per point
+    assert (img.drawWidth, img.drawHeight) == (300, 150)
+    assert (img.imageWidth, img.imageHeight) == (600, 300)
+
+    misses = pdf_image_cache.stats()["misses"]
+    make_scaled_image(pano, max_w=300, max_h=300, dpi=144)
+    assert pdf_image_cache.stats()["misses"] == misses
+
+
+def test_jpeg_at_the_target_size_is_embedded_unchanged():
+    pano = encoded("RGB", (200, 100), "JPEG")
+    assert resample_image(pano, (200, 100)) is pano
+
+
+def test_transparent_image_keeps_its_alpha():
+    sign = Image.open(BytesIO(resample_image(encoded("RGBA", (800, 800), "PNG"), (200, 200))))
+    assert (sign.format, sign.mode, sign.size) == ("PNG", "RGBA", (200, 200))
+
+
+def test_binary_image_streams_only_while_building():
+    original = rl_config.useA85
+    rl_config.useA85 = 1
+    try:
+        with binary_image_streams():
+            with binary_image_streams():
+                assert rl_config.useA85 == 0
+            # the outer build is still running
+            assert rl_config.useA85 == 0
+        assert rl_config.useA85 == 1
+    finally:
+        rl_config.useA85 = original
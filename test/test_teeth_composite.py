@@ -0,0 +1,43 @@
+from PIL import Image
+
+from components.teeth_composite import compose_teeth, compose_teeth_cached
+
+
+def solid_icon(width, height, color):
+    return Image.new("RGBA", (width, height), color)
+
+
+def fake_get_image(tooth, status):
+    return solid_icon(10 if tooth % 2 else 6, 20, (0, 0, 255, 255) if status else (0, 255, 0, 128))
+
+
+def test_compose_teeth_lays_out_equal_slots():
+    teeth = {11: None, 12: "missing", 21: None, 22: None}
+    img = compose_teeth(teeth, [[11, 12], [21, 22]], fake_get_image, row_gap=4)
+
+    assert img.size == (20, 44)
+    # tooth 12 is 6 wide, centered in its 10 wide slot
+    assert img.getpixel((11, 10))[3] == 0
+    assert img.getpixel((12, 10)) == (0, 0, 255, 255)
+    assert img.getpixel((5, 22))[3] == 0  # the gap between the rows
+
+
+def test_cached_composite_depends_on_the_image_source_and_size():
+    def get_image(tooth, status, height, icon_variant):
+        return solid_icon(10, height, (255, 255, 255, 255) if icon_variant == "white" else (0, 0, 0, 255))
+
+    teeth = {11: None, 12: None}
+    small = compose_teeth_cached(teeth, [[11, 12]], get_image, height=20)
+    assert compose_teeth_cached(teeth, [[11, 12]], get_image, height=20) is small
+    assert compose_teeth_cached(teeth, [[11, 12]], get_image, height=30).height == 30
+    black = compose_teeth_cached(teeth, [[11, 12]], get_image, height=20, icon_variant="black")
+    assert black.getpixel((0, 0)) == (0, 0, 0, 255)
+
+
+def test_compose_teeth_blends_alpha_and_outlines_corrected_teeth():
+    teeth = {11: None, 12: "missing"}
+    img = compose_teeth(teeth, [[11, 12]], fake_get_image, corrected_teeth={12})
+
+    assert img.getpixel((5, 10)) == (0, 255, 0, 128)
+    assert img.getpixel((12, 0)) == (255, 0, 0, 255)  # outline of tooth 12
+    assert img.getpixel((15, 10)) == (0, 0, 255, 255)
@@ -0,0 +1,30 @@
+import pytest
+
+from AIOutput.teethSet import teeth as ai_teeth
+from components.teeth_templates import AI_TEMPLATE, MANUAL_TEMPLATE, MISSING_TEMPLATE, new_dentition
+from components.tooth_status import ToothFlag
+from input.teethSet import teeth as manual_teeth
+
+
+def test_templates_are_read_only():
+    for template in (MANUAL_TEMPLATE, MISSING_TEMPLATE, AI_TEMPLATE):
+        assert template.frozen and template.adult.frozen and template.child.frozen
+    with pytest.raises(ValueError):
+        MANUAL_TEMPLATE[16] = "missing"
+    with pytest.raises(ValueError):
+        AI_TEMPLATE.child[55] = ToothFlag.NORMAL
+
+
+def test_templates_match_the_teeth_sets():
+    assert MANUAL_TEMPLATE.adult.to_dict() == manual_teeth
+    assert AI_TEMPLATE.adult.to_dict() == ai_teeth
+    assert set(MISSING_TEMPLATE.adult.values()) == {ToothFlag.MISSING}
+
+
+def test_sessions_get_independent_copies():
+    first, second = new_dentition(MANUAL_TEMPLATE), new_dentition(MANUAL_TEMPLATE)
+    first.adult[16] = "normal,df"
+    assert not first.frozen
+    assert first[16] == ToothFlag.NORMAL | ToothFlag.DF
+    assert second[16] == MANUAL_TEMPLATE[16] == 0
+    assert manual_teeth[16] is None
@@ -0,0 +1,77 @@
+from components.icon_encoding import mime_type
+from components.settings import DATA_URL_ICON_ENCODING
+from components.tooth_cache import ToothImageCache, tooth_image_cache
+from components.teeth import (circle_fragment, get_tooth_image, get_tooth_image_bytes, get_tooth_image_reader,
+                              warm_tooth_image_cache)
+
+
+def test_cache_counts_hits_and_misses():
+    cache = ToothImageCache(max_bytes=1024)
+    assert cache.get_or_create("a", lambda: b"x" * 10) == b"x" * 10
+    assert cache.get_or_create("a", lambda: b"y" * 10) == b"x" * 10
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bytes"] == 10
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ToothImageCache(max_bytes=100)
+    cache.put("a", b"a" * 40)
+    cache.put("b", b"b" * 40)
+    cache.get("a")
+    cache.put("c", b"c" * 40)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_get_tooth_image_is_memoized():
+    tooth_image_cache.clear()
+    first = get_tooth_image(16, "normal,df")
+    second = get_tooth_image(16, "normal,df")
+    assert first is second
+    assert first.size[1] == 80
+
+    data_url, (width, height) = get_tooth_image(16, "normal,df", as_base64=True)
+    assert data_url.startswith(f"data:{mime_type(DATA_URL_ICON_ENCODING)};base64,")
+    assert (width, height) == first.size
+
+
+def test_warm_up_fills_cache():
+    tooth_image_cache.clear()
+    count = warm_tooth_image_cache([11, 12], [None, "missing"], heights=(40,))
+    assert count == 4
+    misses = tooth_image_cache.stats()["misses"]
+    get_tooth_image(12, "missing", height=40)
+    assert tooth_image_cache.stats()["misses"] == misses
+
+
+def test_encoded_bytes_are_cached_per_encoding():
+    tooth_image_cache.clear()
+    png = get_tooth_image_bytes(16, "normal,df", encoding="png")
+    webp = get_tooth_image_bytes(16, "normal,df", encoding="webp")
+    assert png.startswith(b"\x89PNG")
+    assert webp[8:12] == b"WEBP"
+    assert get_tooth_image_bytes(16, "normal,df", encoding="png") is png
+
+
+def test_pdf_readers_are_shared():
+    tooth_image_cache.clear()
+    reader = get_tooth_image_reader(16, "normal,df", height=36)
+    assert get_tooth_image_reader(16, "normal,df", height=36) is reader
+    assert reader.getSize() == get_tooth_image(16, "normal,df", height=36).size
+    # the cache accounts for the RGB and alpha planes
+    width, height = reader.getSize()
+    assert tooth_image_cache.stats()["bytes"] >= width * height * 4
+
+
+def test_circle_fragments_follow_the_icon_source(monkeypatch):
+    monkeypatch.setattr("components.teeth.get_tooth_image_src", lambda tooth, status: ("data:inline", (10, 20)))
+    inline = circle_fragment(16, None, 1.0, 2.0, 0.0, None, None)
+    monkeypatch.setattr("components.teeth.get_tooth_image_src", lambda tooth, status: ("app/static/v1", (10, 20)))
+    assert circle_fragment(16, None, 1.0, 2.0, 0.0, None, None) == inline
+    assert 'src="app/static/v1"' in circle_fragment(16, None, 1.0, 2.0, 0.0, None, "v1")
@@ -0,0 +1,73 @@
+from itertools import combinations, permutations
+
+from AIOutput import teethSet as ai_teeth_set
+from benchmarks.legacy_status import legacy_icon_path
+from components.teeth_renderer import toggle_tooth_presence
+from components.tooth_status import (ToothFlag, format_status, format_teeth, parse_status, parse_teeth,
+                                     resolve_icon_path)
+from input import teethSet as input_teeth_set
+
+ADULT_TEETH = [q + n for q in (10, 20, 30, 40) for n in range(1, 9)]
+CHILD_TEETH = [q + n for q in (50, 60, 70, 80) for n in range(1, 6)]
+EXTRA_FLAGS = ("impacted", "df", "bridge", "crown", "rcf", "implant")
+
+
+def reachable_statuses():
+    # toggle_tooth_presence always starts with a presence flag and appends the rest in click order
+    statuses = [None, "normal", "missing"]
+    for presence in ("normal", "missing"):
+        for size in range(1, len(EXTRA_FLAGS) + 1):
+            for combo in combinations(EXTRA_FLAGS, size):
+                for order in permutations(combo):
+                    statuses.append(",".join((presence, *order)))
+    return statuses
+
+
+def test_resolver_matches_legacy_chain_for_every_reachable_status():
+    for status in reachable_statuses():
+        for tooth in ADULT_TEETH + CHILD_TEETH:
+            assert resolve_icon_path(tooth, status) == legacy_icon_path(tooth, status), (tooth, status)
+
+
+def test_child_teeth_borrow_adult_icons():
+    assert resolve_icon_path(54, "normal,df") == "Icon_df/16.png"
+    assert resolve_icon_path(83, "missing") == "Icon_missing_teeth/43.png"
+    assert resolve_icon_path(54, "normal") == "Icon_normal_teeth/54.png"
+
+
+def test_unrecognized_status_falls_back_to_normal_icon():
+    assert resolve_icon_path(25, "bridgde,rcf") == "Icon_normal_teeth/25.png"
+
+
+def test_teeth_sets_round_trip_through_flags():
+    for teeth in (input_teeth_set.teeth, input_teeth_set.childteeth, input_teeth_set.missingteeth,
+                  ai_teeth_set.teeth, ai_teeth_set.childteeth):
+        flags = parse_teeth(teeth)
+        assert all(isinstance(value, ToothFlag) for value in flags.values())
+        assert format_teeth(flags) == teeth
+
+
+def test_every_flag_combination_round_trips():
+    for mask in range(1 << len(ToothFlag)):
+        assert parse_status(format_status(mask)) == mask
+    assert parse_status(None) == 0
+    assert format_status(ToothFlag(0)) is None
+    assert format_status(ToothFlag.RCF | ToothFlag.NORMAL | ToothFlag.DF) == "normal,df,rcf"
+
+
+def test_flags_resolve_to_the_same_icon_as_strings():
+    for status in ("normal,df,rcf", "missing,implant", "missing,bridge", None):
+        assert resolve_icon_path(16, parse_status(status)) == resolve_icon_path(16, status)
+
+
+def test_toggle_tooth_presence():
+    teeth = {16: ToothFlag(0)}
+    toggle_tooth_presence(ToothFlag.NORMAL, 16, teeth)
+    toggle_tooth_presence(ToothFlag.DF, 16, teeth)
+    toggle_tooth_presence(ToothFlag.RCF, 16, teeth)
+    assert format_status(teeth[16]) == "normal,df,rcf"
+    toggle_tooth_presence(ToothFlag.DF, 16, teeth)
+    assert teeth[16] == ToothFlag.NORMAL | ToothFlag.RCF
+    # unchecking "Present" clears the tooth
+    toggle_tooth_presence(ToothFlag.NORMAL, 16, teeth)
+    assert teeth[16] == 0
@@ -0,0 +1,48 @@
+from components.tooth_status import ICON_DIR_BY_FLAGS, ToothFlag, status_tags
+from components.tooth_transitions import (ALL_STATUSES, DIALOG_STATES, REACHABLE_STATUSES, TRANSITIONS,
+                                          enabled_flags)
+
+F = ToothFlag
+
+
+def legacy_dialog(s):
+    # the if/else chain show_options used before the table: [(label, checked, disabled)]
+    boxes = []
+    present = F.NORMAL in s and F.MISSING not in s
+    missing = F.MISSING in s and F.NORMAL not in s
+    boxes.append(("Present", present, F.MISSING in s))
+    boxes.append(("Missing", missing, F.NORMAL in s))
+    if present:
+        boxes.append(("Impacted", F.IMPACTED in s, bool(s & (F.BRIDGE | F.CROWN | F.RCF | F.DF))))
+        boxes.append(("Dental filling", F.DF in s, bool(s & (F.CROWN | F.BRIDGE | F.RCF | F.IMPACTED))))
+        boxes.append(("Bridge", F.BRIDGE in s, bool(s & (F.DF | F.CROWN | F.RCF | F.IMPACTED))))
+        boxes.append(("Crown", F.CROWN in s, bool(s & (F.DF | F.BRIDGE | F.RCF | F.IMPACTED))))
+        boxes.append(("Root canal filling", F.RCF in s, not s & (F.CROWN | F.BRIDGE | F.DF)))
+    if missing:
+        boxes.append(("Implant", F.IMPLANT in s, F.CROWN in s))
+        boxes.append(("Bridge", F.BRIDGE in s, F.CROWN in s))
+        boxes.append(("Crown", F.CROWN in s, not (F.IMPLANT in s and F.BRIDGE not in s)))
+    return boxes
+
+
+def test_table_matches_legacy_dialog_for_every_status():
+    assert len(DIALOG_STATES) == 256
+    for status in ALL_STATUSES:
+        state = DIALOG_STATES[status]
+        boxes = [(box.label, box.checked, box.disabled) for box in (state.present, state.missing, *state.options)]
+        assert boxes == legacy_dialog(status), status
+
+
+def test_transitions():
+    assert TRANSITIONS[F(0), F.NORMAL] == F.NORMAL
+    assert TRANSITIONS[F.NORMAL | F.DF, F.RCF] == F.NORMAL | F.DF | F.RCF
+    assert TRANSITIONS[F.NORMAL | F.DF | F.RCF, F.NORMAL] == 0
+    assert TRANSITIONS[F.MISSING | F.IMPLANT, F.IMPLANT] == F.MISSING
+
+
+def test_every_reachable_status_has_an_icon():
+    assert F(0) in REACHABLE_STATUSES and F.NORMAL | F.DF | F.RCF in REACHABLE_STATUSES
+    assert F.NORMAL | F.MISSING not in REACHABLE_STATUSES
+    for status in REACHABLE_STATUSES:
+        assert frozenset(status_tags(status)) in ICON_DIR_BY_FLAGS, status
+    assert enabled_flags(F.MISSING | F.IMPLANT | F.CROWN) == [F.MISSING, F.CROWN]